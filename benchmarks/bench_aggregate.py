@@ -0,0 +1,132 @@
+"""
+Raw frame + invoice pivot on 1M synthetic rows: the previous path (TDS mapped
+row by row through the dict, text invoice keys, groupby().agg() with mixed
+max/sum/first, then copies) against RowBuffer's categorical frame and
+aggregate.build_pivot(). Reports wall time and tracemalloc peak per stage and
+checks the shared summary columns are identical.
+
+    python -m benchmarks.bench_aggregate [--rows 1000000]
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from payment_advice.aggregate import build_pivot
+from payment_advice.rows import RAW_COLUMNS, STATUSES, AdviceRow, RowBuffer, text_dtype
+
+LEGACY_COLUMNS = [
+    'Invoice Number', 'Final Paid Amount', 'TDS',
+    'Invoice Amount', 'GST Adjustment', 'Payment Amount', 'Debit Note', 'Invoice Date'
+]
+
+
+def synthetic_rows(n: int, seed: int = 0):
+    """
+    Main entries with GST adjustments for about a third of the invoices, some
+    of them arriving pages later, and a TDS capture for most invoices.
+    """
+    rng = random.Random(seed)
+    buf = RowBuffer()
+    tds = {}
+    late = []
+    k = 0
+    while len(buf) + len(late) < n:
+        k += 1
+        inv = f"VCC/24-25/{k:07d}"
+        amt = round(rng.uniform(1_000, 500_000), 2)
+        date = f"{rng.randint(1, 28):02d}.04.2024"
+        debit = round(rng.uniform(100, 5_000), 2) if rng.random() < 0.2 else 0.0
+        buf.append(AdviceRow(inv, date, amt, 0.0, round(amt * 0.98, 2), debit, STATUSES[0]))
+        if rng.random() < 0.9:
+            tds[inv] = -round(amt * 0.02, 2)
+        if rng.random() < 0.35:
+            gst = round(amt * 0.18, 2) * (1 if rng.random() < 0.5 else -1)
+            row = AdviceRow(inv, date, 0.0, gst, 0.0, 0.0, STATUSES[1] if gst > 0 else STATUSES[2])
+            if rng.random() < 0.3:
+                late.append(row)
+            else:
+                buf.append(row)
+    for row in late[: n - len(buf)]:
+        buf.append(row)
+    return buf, tds
+
+
+def legacy_frame(buf, tds_map_signed):
+    invoices = list(buf.invoices)
+    invoice_number = [invoices[c] for c in buf.invoice_code]
+    tds = np.fromiter((tds_map_signed.get(inv, 0.0) for inv in invoice_number), dtype=np.float64, count=len(buf))
+    return pd.DataFrame({
+        'Invoice Number': pd.Series(invoice_number, dtype=text_dtype()),
+        'Invoice Date': pd.Series(buf.invoice_date, dtype=text_dtype()),
+        'Invoice Amount': np.array(buf.invoice_amount, dtype=np.float64),
+        'GST Adjustment': np.array(buf.gst_adjustment, dtype=np.float64),
+        'Payment Amount': np.array(buf.payment_amount, dtype=np.float64),
+        'TDS_Signed': tds,
+        'Debit Note': np.array(buf.debit_note, dtype=np.float64),
+        'Status': pd.Categorical.from_codes(np.array(buf.status, dtype=np.int8), STATUSES),
+    }, columns=RAW_COLUMNS)
+
+
+def legacy_pivot(df_all):
+    pivot_df = df_all.groupby(['Invoice Number'], as_index=False).agg({
+        'Invoice Amount': 'max',
+        'GST Adjustment': 'sum',
+        'Payment Amount': 'sum',
+        'TDS_Signed': 'max',
+        'Debit Note': 'sum',
+        'Invoice Date': 'first'
+    })
+    pivot_df['Final Paid Amount'] = pivot_df['Payment Amount'] + pivot_df['GST Adjustment']
+    pivot_df['TDS'] = pivot_df['TDS_Signed'].abs()
+    return pivot_df[LEGACY_COLUMNS].copy()
+
+
+def measure(fn, *args):
+    # Timed and traced in separate calls; tracemalloc slows object-heavy code unevenly.
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    out = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    buf, tds = synthetic_rows(args.rows)
+    print(f"{len(buf)} rows, {len(buf.invoices)} invoices")
+    results = {}
+    for name, make_frame, make_pivot in (
+        ("legacy", legacy_frame, legacy_pivot),
+        ("vectorised", RowBuffer.to_frame, build_pivot),
+    ):
+        df_all, frame_s, frame_mb = measure(make_frame, buf, tds)
+        pivot_df, pivot_s, pivot_mb = measure(make_pivot, df_all)
+        results[name] = pivot_df
+        print(
+            f"{name:<11} frame {frame_s:6.3f}s peak {frame_mb:6.1f} MB   "
+            f"pivot {pivot_s:6.3f}s peak {pivot_mb:6.1f} MB   total {frame_s + pivot_s:6.3f}s"
+        )
+        del df_all
+
+    legacy, new = results["legacy"], results["vectorised"]
+    same = all(
+        np.array_equal(legacy[c].to_numpy(), new[c].to_numpy())
+        for c in LEGACY_COLUMNS
+    )
+    print(f"summary columns identical: {same}; mismatched invoices: {int(new['Mismatch'].sum())}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Line classifier micro-benchmark: the original per-call re.search/re.match
+functions against the precompiled fast path, over ~1M synthetic advice lines.
+
+    python -m benchmarks.bench_classifier [--lines 1000000]
+"""
+import argparse
+import re
+import time
+
+from benchmarks.synthetic_advice import LINES_PER_PAGE, advice_lines
+from payment_advice.parser import parse_pages
+from payment_advice.profiles import VCC
+
+
+# ---- Reference implementation (as shipped in app.py v4.4) ----
+
+def legacy_parse_signed_number(x):
+    match = re.search(r'-?\d+(?:,\d{3})*(?:\.\d{1,2})?-?', str(x))
+    if match:
+        num_str = match.group(0).replace(',', '')
+        if num_str.endswith('-') and not num_str.startswith('-'):
+            num_str = '-' + num_str[:-1]
+        return float(num_str)
+    return 0.0
+
+
+def legacy_is_invoice_no(s):
+    return bool(re.match(r'^(R\d+|VCC[-/]?\w+)', s, re.IGNORECASE))
+
+
+def legacy_is_date(s):
+    return bool(re.match(r'\d{2}\.\d{2}\.\d{4}', s))
+
+
+def legacy_extract_debit(line):
+    match = re.search(r'Rs\.?([\d,]+\.\d{1,2})', line)
+    return float(match.group(1).replace(',', '')) if match else 0.0
+
+
+def legacy_parse_pages(page_texts):
+    data = []
+    tds_map_signed = {}
+    seen_entries = set()
+    last_invoice = None
+    for text in page_texts:
+        lines = text.split("\n")
+        i = 0
+        while i < len(lines):
+            tokens = lines[i].split()
+            if len(tokens) >= 4 and legacy_is_invoice_no(tokens[1]):
+                inv_no = tokens[1]
+                inv_amt = legacy_parse_signed_number(tokens[2])
+                pay_amt = legacy_parse_signed_number(tokens[3])
+                status = "MAIN ENTRY"
+                inv_date = ""
+                if i + 1 < len(lines):
+                    date_tokens = lines[i + 1].split()
+                    if len(date_tokens) >= 2 and legacy_is_date(date_tokens[0]) and legacy_is_date(date_tokens[1]):
+                        inv_date = date_tokens[1]
+                        i += 1
+                debit_val = 0.0
+                if i + 1 < len(lines) and "Short payment" in lines[i + 1]:
+                    debit_val = legacy_extract_debit(lines[i + 1])
+                    i += 1
+                key = (inv_no, pay_amt, status)
+                if key not in seen_entries:
+                    data.append({
+                        'Invoice Number': inv_no, 'Invoice Date': inv_date, 'Invoice Amount': inv_amt,
+                        'GST Adjustment': 0.0, 'Payment Amount': pay_amt, 'TDS_Signed': 0.0,
+                        'Debit Note': debit_val, 'Status': status
+                    })
+                    seen_entries.add(key)
+                last_invoice = inv_no
+            elif len(tokens) >= 3 and legacy_is_invoice_no(tokens[1]):
+                inv_no = tokens[1]
+                pay_amt = legacy_parse_signed_number(tokens[2])
+                status = "GST PAID" if pay_amt > 0 else "GST HOLD"
+                inv_date = ""
+                if i + 1 < len(lines):
+                    date_tokens = lines[i + 1].split()
+                    if len(date_tokens) >= 2 and legacy_is_date(date_tokens[0]) and legacy_is_date(date_tokens[1]):
+                        inv_date = date_tokens[1]
+                        i += 1
+                key = (inv_no, pay_amt, status)
+                if key not in seen_entries:
+                    data.append({
+                        'Invoice Number': inv_no, 'Invoice Date': inv_date, 'Invoice Amount': 0.0,
+                        'GST Adjustment': pay_amt, 'Payment Amount': 0.0, 'TDS_Signed': 0.0,
+                        'Debit Note': 0.0, 'Status': status
+                    })
+                    seen_entries.add(key)
+                last_invoice = inv_no
+            if "TDS Amount" in lines[i] and last_invoice:
+                if last_invoice not in tds_map_signed:
+                    nums = [legacy_parse_signed_number(n) for n in lines[i].split() if re.search(r'\d', n)]
+                    if nums:
+                        tds_map_signed[last_invoice] = nums[0]
+            i += 1
+    return data, tds_map_signed
+
+
+LEGACY_FIELDS = [
+    'Invoice Number', 'Invoice Date', 'Invoice Amount', 'GST Adjustment',
+    'Payment Amount', 'Debit Note', 'Status'
+]
+
+
+def same_output(legacy_out, fast_out) -> bool:
+    legacy_rows = [tuple(row[f] for f in LEGACY_FIELDS) for row in legacy_out[0]]
+    fast_rows = [tuple(row) for row in fast_out[0]]
+    return legacy_rows == fast_rows and legacy_out[1] == fast_out[1]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    pages = ["\n".join(lines) for lines in advice_lines(max(1, args.lines // LINES_PER_PAGE))]
+    n_lines = sum(text.count("\n") + 1 for text in pages)
+
+    legacy_s, legacy_out = timed(legacy_parse_pages, pages)
+    fast_s, fast_out = timed(parse_pages, pages, VCC)
+
+    print(f"lines      {n_lines:,}")
+    print(f"legacy     {legacy_s:8.2f}s  {n_lines / legacy_s:12,.0f} lines/s")
+    print(f"fast path  {fast_s:8.2f}s  {n_lines / fast_s:12,.0f} lines/s  speedup x{legacy_s / fast_s:.2f}")
+    print("outputs    " + ("identical" if same_output(legacy_out, fast_out) else "MISMATCH"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Text engine vs layout engine: speed and agreement on a synthetic fixture corpus.
+
+Each fixture is rendered three times from the same seed: clean, with a share of
+invoice amounts drawn as two words, and that again behind a cover page 1 holding
+only the header (so the layout engine calibrates its columns on page 2). The
+clean render's text-engine parse is the expected result for all three.
+
+    python -m benchmarks.bench_layout [--pages 50] [--docs 6]
+"""
+import argparse
+import time
+
+from benchmarks.synthetic_advice import advice_rows, build_pdf, synthetic_advice
+from payment_advice import parse_advice
+
+CORPUS_PROFILES = [("30305409", "VCC"), ("30300689", "UKM")]
+KINDS = ("clean", "drift", "cover")
+# Page 1 opens with the title, account and column header rows.
+HEADER_ROWS = 4
+
+
+def same(a, b) -> bool:
+    return a.raw.equals(b.raw) and a.pivot.equals(b.pivot) and a.tds_map_signed == b.tds_map_signed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--docs", type=int, default=6)
+    parser.add_argument("--split-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    timings = {"text": 0.0, "layout": 0.0}
+    agree = {engine: dict.fromkeys(KINDS, 0) for engine in ("text", "layout")}
+    for seed in range(args.docs):
+        account, prefix = CORPUS_PROFILES[seed % len(CORPUS_PROFILES)]
+        clean = synthetic_advice(args.pages, account=account, prefix=prefix, seed=seed)
+        rows = advice_rows(args.pages, account=account, prefix=prefix, seed=seed, split_amount_rate=args.split_rate)
+        drift = build_pdf(rows)
+        cover = build_pdf([rows[0][:HEADER_ROWS], rows[0][HEADER_ROWS:]] + rows[1:])
+        expected = parse_advice(clean)
+        for engine in ("text", "layout"):
+            for kind, pdf_bytes in (("clean", clean), ("drift", drift), ("cover", cover)):
+                start = time.perf_counter()
+                result = parse_advice(pdf_bytes, engine=engine)
+                if kind == "clean":
+                    timings[engine] += time.perf_counter() - start
+                agree[engine][kind] += same(result, expected)
+
+    total_pages = args.pages * args.docs
+    for engine in ("text", "layout"):
+        print(
+            f"{engine:<7} {timings[engine]:7.2f}s  {total_pages / timings[engine]:7.1f} pages/s  "
+            f"agrees on {agree[engine]['clean']}/{args.docs} clean, "
+            f"{agree[engine]['drift']}/{args.docs} with split amounts, "
+            f"{agree[engine]['cover']}/{args.docs} with split amounts behind a cover page"
+        )
+    print(f"layout speedup x{timings['text'] / timings['layout']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Ledger reader benchmark on a synthetic E-Invoice Ledger in CSV, XLSX and
+(when an .xls fixture is supplied) legacy XLS.
+
+"legacy" is the original read_table(): pd.read_excel on every upload, falling
+back to pd.read_csv, reading every column. "sniffed" is the current
+read_table() with only the two ledger columns.
+
+    python -m benchmarks.bench_ledger [--rows 500000] [--xls path/to/ledger.xls]
+"""
+import argparse
+import os
+import tempfile
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from payment_advice.enrich import LEDGER_REQUIRED, read_table
+
+STATES = ["TAMIL NADU", "KERALA", "KARNATAKA", "MAHARASHTRA", "GUJARAT", "DELHI"]
+
+
+def legacy_read_table(file):
+    try:
+        df = pd.read_excel(file)
+    except Exception:
+        file.seek(0)
+        df = pd.read_csv(file)
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def synthetic_ledger(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Invoice Number': [f"VCC/24-25/{k:06d}" for k in range(rows)],
+        'Invoice Date': "01.04.2024",
+        'Customer': "RELIANCE INDUSTRIES LIMITED",
+        'Ship To (State)': rng.choice(STATES, rows),
+        'Taxable Value': rng.uniform(1_000, 500_000, rows).round(2),
+        'IGST': rng.uniform(100, 90_000, rows).round(2),
+    })
+
+
+def timed(fn, data: bytes):
+    start = time.perf_counter()
+    df = fn(BytesIO(data))
+    return time.perf_counter() - start, len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--xls", help="Existing legacy .xls ledger to include")
+    args = parser.parse_args()
+
+    ledger = synthetic_ledger(args.rows)
+    fixtures = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "ledger.csv")
+        ledger.to_csv(csv_path, index=False)
+        xlsx_path = os.path.join(tmp, "ledger.xlsx")
+        ledger.to_excel(xlsx_path, index=False)
+        for fmt, path in (("csv", csv_path), ("xlsx", xlsx_path), ("xls", args.xls)):
+            if path:
+                with open(path, "rb") as fh:
+                    fixtures[fmt] = fh.read()
+    if "xls" not in fixtures:
+        print("xls: skipped (pandas cannot write .xls; pass --xls to include one)")
+
+    for fmt, data in fixtures.items():
+        legacy_s, legacy_rows = timed(legacy_read_table, data)
+        new_s, new_rows = timed(lambda f: read_table(f, columns=LEDGER_REQUIRED), data)
+        print(
+            f"{fmt:<5} legacy {legacy_s:7.2f}s  sniffed {new_s:7.2f}s  "
+            f"speedup x{legacy_s / new_s:5.1f}  rows {legacy_rows}/{new_rows}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Peak RSS of full parsing vs streaming summarisation as page count grows.
+
+Every measurement runs in a fresh interpreter so peaks do not carry over.
+
+    python -m benchmarks.bench_memory [--pages 250 500 1000 2000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic_advice import synthetic_advice
+
+CHILD = """
+import resource, sys, time
+from payment_advice import parse_advice
+from payment_advice.stream import summarize_advice
+mode, path = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+if mode == "full":
+    invoices = len(parse_advice(path).pivot)
+else:
+    invoices = len(summarize_advice(path)[1])
+elapsed = time.perf_counter() - start
+print(invoices, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure(mode: str, path: str):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, path],
+        check=True, capture_output=True, text=True, cwd=root,
+    ).stdout.split()
+    invoices, elapsed, max_rss_kb = int(out[0]), float(out[1]), int(out[2])
+    return invoices, elapsed, max_rss_kb / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"advice_{pages}.pdf")
+            with open(path, "wb") as fh:
+                fh.write(synthetic_advice(pages))
+            for mode in ("full", "stream"):
+                invoices, elapsed, peak_mb = measure(mode, path)
+                print(f"{pages:>5} pages  {mode:<6}  {invoices:>6} invoices  {elapsed:7.2f}s  peak RSS {peak_mb:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
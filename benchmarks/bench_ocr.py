@@ -0,0 +1,78 @@
+"""
+OCR fallback on mixed digital/scanned advices. Needs pytesseract and the
+tesseract binary.
+
+The same advice is parsed four ways:
+- its digital original;
+- with --scanned of its pages as images (cold OCR cache);
+- that mixed document again (warm cache);
+- every page scanned, which is what OCR-ing whole documents would cost.
+
+Rows recovered from the mixed document are compared with the digital
+original, which measures what OCR misreads.
+
+    python -m benchmarks.bench_ocr [--pages 20] [--scanned 4] [--workers 4]
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.synthetic_advice import advice_rows, build_pdf
+from payment_advice import parse_advice
+from payment_advice.instrument import collect
+from payment_advice.ocr import ocr_available, ocr_cache
+
+
+def entry_keys(result) -> set:
+    raw = result.raw
+    return set(zip(raw['Invoice Number'], raw['Invoice Amount'], raw['Payment Amount'], raw['GST Adjustment']))
+
+
+def timed_parse(pdf, workers, ocr):
+    with collect("bench") as stats:
+        start = time.perf_counter()
+        result = parse_advice(pdf, workers=workers, ocr=ocr)
+        elapsed = time.perf_counter() - start
+    return result, elapsed, stats.counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--scanned", type=int, default=4, help="Pages rendered as images, page 1 included")
+    parser.add_argument("--workers", type=int, default=4, help="OCR worker processes")
+    args = parser.parse_args()
+    if not ocr_available():
+        print("OCR benchmark needs pytesseract and the tesseract binary", file=sys.stderr)
+        return 2
+
+    rows = advice_rows(args.pages, seed=11)
+    step = max(1, args.pages // max(1, args.scanned))
+    scanned = set(range(0, args.pages, step)[: args.scanned])
+    digital = build_pdf(rows)
+    mixed = build_pdf(rows, scanned=scanned)
+    all_scanned = build_pdf(rows, scanned=set(range(args.pages)))
+
+    ocr_cache().clear()
+    want, digital_s, _ = timed_parse(digital, 1, False)
+    got, cold_s, cold = timed_parse(mixed, args.workers, True)
+    _, warm_s, warm = timed_parse(mixed, args.workers, True)
+    ocr_cache().clear()
+    _, full_s, full = timed_parse(all_scanned, args.workers, True)
+
+    print(f"{args.pages} pages, {len(scanned)} scanned: {sorted(n + 1 for n in scanned)}")
+    print(f"digital original          {digital_s:7.2f}s")
+    print(f"mixed, cold OCR cache     {cold_s:7.2f}s   pages OCR'd {cold.get('pages_ocr', 0)}")
+    print(f"mixed, warm OCR cache     {warm_s:7.2f}s   cache hits  {warm.get('ocr_cache_hit', 0)}")
+    print(f"every page scanned        {full_s:7.2f}s   pages OCR'd {full.get('pages_ocr', 0)}")
+    want_keys, got_keys = entry_keys(want), entry_keys(got)
+    recovered = len(want_keys & got_keys)
+    print(
+        f"entries recovered {recovered}/{len(want_keys)} ({recovered / len(want_keys):.1%}), "
+        f"spurious {len(got_keys - want_keys)}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Page prefilter: pages skipped, time saved, and agreement with full extraction.
+
+Each fixture interleaves advice pages with boilerplate pages (cover, remittance
+summary, terms, bank details) and is parsed with and without the prefilter, by both
+engines and with split amounts. Each fixture also breaks one invoice over
+pages: its rows on a page with no TDS line, drawn as kerned TJ arrays of hex
+strings, and its TDS line alone on the next page, drawn word by word from the
+end of the line ("Amount" before "TDS"). Results must be identical.
+
+    python -m benchmarks.bench_prefilter [--pages 40] [--docs 6] [--every 2]
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.synthetic_advice import advice_rows, build_pdf, with_boilerplate
+from payment_advice import parse_advice
+from payment_advice.instrument import collect
+
+CORPUS_PROFILES = [("30305409", "VCC"), ("30300689", "UKM")]
+ENGINES = ("text", "layout")
+
+
+def same(a, b) -> bool:
+    return a.raw.equals(b.raw) and a.pivot.equals(b.pivot) and a.tds_map_signed == b.tds_map_signed
+
+
+def break_around_tds(pages):
+    """
+    Splits the first advice page after page 1 around its first TDS line: returns
+    the pages, the index of the page left with invoice rows but no TDS line, and
+    the index of the page holding only that TDS line.
+    """
+    index = next(n for n in range(1, len(pages)) if any(row[0][1] == "TDS Amount" for row in pages[n]))
+    rows = pages[index]
+    cut = next(n for n, row in enumerate(rows) if row[0][1] == "TDS Amount")
+    return pages[:index] + [rows[:cut], rows[cut:cut + 1], rows[cut + 1:]] + pages[index + 1:], index, index + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=40, help="Advice pages per fixture")
+    parser.add_argument("--docs", type=int, default=6)
+    parser.add_argument("--every", type=int, default=2, help="Boilerplate page after every N advice pages")
+    args = parser.parse_args()
+
+    timings = {(engine, on): 0.0 for engine in ENGINES for on in (False, True)}
+    total_pages = skipped = mismatches = 0
+    for seed in range(args.docs):
+        account, prefix = CORPUS_PROFILES[seed % len(CORPUS_PROFILES)]
+        pages = with_boilerplate(
+            advice_rows(args.pages, account=account, prefix=prefix, seed=seed, split_amount_rate=0.05 * (seed % 2)),
+            every=args.every, seed=seed,
+        )
+        pages, no_tds, tds_only = break_around_tds(pages)
+        pdf_bytes = build_pdf(pages, hex_tj={no_tds}, out_of_order={tds_only})
+        total_pages += len(pages) * len(ENGINES)
+        for engine in ENGINES:
+            results = {}
+            for on in (False, True):
+                with collect(f"seed{seed}-{engine}") as stats:
+                    start = time.perf_counter()
+                    results[on] = parse_advice(pdf_bytes, engine=engine, prefilter=on)
+                    timings[engine, on] += time.perf_counter() - start
+                if on:
+                    skipped += stats.counters.get("pages_skipped", 0)
+            if not same(results[False], results[True]):
+                mismatches += 1
+                print(f"MISMATCH seed={seed} engine={engine}", file=sys.stderr)
+
+    for engine in ENGINES:
+        full, filtered = timings[engine, False], timings[engine, True]
+        print(f"{engine:<7} full {full:7.2f}s  prefiltered {filtered:7.2f}s  speedup x{full / filtered:.2f}")
+    print(f"pages skipped {skipped}/{total_pages}; {args.docs * len(ENGINES) - mismatches}/"
+          f"{args.docs * len(ENGINES)} parses identical to full extraction")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Row accumulation: list-of-dicts + pd.DataFrame(data) against RowBuffer, on
+100k synthetic rows. Reports wall time and tracemalloc peak for accumulate +
+materialise.
+
+    python -m benchmarks.bench_rows [--rows 100000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import pandas as pd
+
+from payment_advice.rows import STATUSES, AdviceRow, RowBuffer
+
+
+def synthetic_rows(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    rows = []
+    for k in range(n):
+        inv = f"VCC/24-25/{k // 2:06d}"
+        amt = round(rng.uniform(1_000, 500_000), 2)
+        rows.append(AdviceRow(inv, "01.04.2024", amt, 0.0, amt * 0.98, 0.0, rng.choice(STATUSES)))
+    tds = {r.invoice_number: -round(r.invoice_amount * 0.02, 2) for r in rows[::2]}
+    return rows, tds
+
+
+def dict_rows(rows, tds):
+    data = []
+    for r in rows:
+        data.append({
+            'Invoice Number': r.invoice_number,
+            'Invoice Date': r.invoice_date,
+            'Invoice Amount': r.invoice_amount,
+            'GST Adjustment': r.gst_adjustment,
+            'Payment Amount': r.payment_amount,
+            'TDS_Signed': 0.0,
+            'Debit Note': r.debit_note,
+            'Status': r.status
+        })
+    df_all = pd.DataFrame(data)
+    df_all['TDS_Signed'] = df_all['Invoice Number'].map(tds).fillna(0.0)
+    return df_all
+
+
+def buffer_rows(rows, tds):
+    buf = RowBuffer()
+    for r in rows:
+        buf.append(r)
+    return buf.to_frame(tds)
+
+
+def measure(fn, rows, tds):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn(rows, tds)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, df.memory_usage(deep=True).sum() / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows, tds = synthetic_rows(args.rows)
+    for name, fn in (("list-of-dicts", dict_rows), ("RowBuffer", buffer_rows)):
+        elapsed, peak_mb, frame_mb = measure(fn, rows, tds)
+        print(f"{name:<14} {elapsed:6.3f}s  peak {peak_mb:7.1f} MB  DataFrame {frame_mb:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
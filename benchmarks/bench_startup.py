@@ -0,0 +1,110 @@
+"""
+Cold-start cost: `python -X importtime` for the package entry points, which
+heavy dependencies each one loads, and wall time of `payment_advice --help`.
+With --before REV the same measurements run on that git revision (extracted
+with git archive) for a before/after comparison.
+
+    python -m benchmarks.bench_startup [--runs 5] [--before HEAD~1]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = [
+    ("package", "import payment_advice"),
+    ("parse API", "from payment_advice import parse_advice, cached_parse_advice"),
+    ("cli", "import payment_advice.cli"),
+    ("app imports", "import payment_advice.export, payment_advice.extract, payment_advice.instrument, "
+                    "payment_advice.parser"),
+]
+HEAVY = ("pandas", "numpy", "pdfplumber", "pdfminer", "openpyxl", "pyarrow")
+
+
+def _top_level(stderr: str) -> dict:
+    # "import time: self [us] | cumulative | name"; nested imports are indented.
+    out = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            out[name.strip()] = int(cumulative)
+    return out
+
+
+def import_ms(tree: str, statement: str, runs: int, baseline: set) -> float:
+    """
+    Best-of-`runs` cumulative import time of `statement`, interpreter start excluded.
+    """
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=tree, capture_output=True, text=True, check=True,
+        )
+        total = sum(us for name, us in _top_level(proc.stderr).items() if name not in baseline)
+        best = total if best is None else min(best, total)
+    return best / 1000
+
+
+def heavy_loaded(tree: str, statement: str) -> list:
+    probe = f"{statement}; import sys; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=tree, capture_output=True, text=True, check=True)
+    return proc.stdout.split()
+
+
+def help_seconds(tree: str, runs: int) -> float:
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "payment_advice", "--help"], cwd=tree, capture_output=True, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(tree: str, runs: int) -> dict:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True)
+    baseline = set(_top_level(proc.stderr))
+    results = {label: (import_ms(tree, stmt, runs, baseline), heavy_loaded(tree, stmt)) for label, stmt in STATEMENTS}
+    results["--help wall"] = (help_seconds(tree, runs) * 1000, [])
+    return results
+
+
+def checkout(rev: str, into: str) -> str:
+    archive = subprocess.run(["git", "archive", rev], cwd=ROOT, capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", into], input=archive, check=True)
+    return into
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="Best of N subprocess runs")
+    parser.add_argument("--before", help="Git revision to compare against")
+    args = parser.parse_args()
+
+    after = measure(ROOT, args.runs)
+    if not args.before:
+        for label, (ms, heavy) in after.items():
+            print(f"{label:<12} {ms:8.1f} ms   {' '.join(heavy) or '-'}")
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = measure(checkout(args.before, tmp), args.runs)
+    print(f"{'':<12} {args.before:>10} {'now':>10}   heavy modules before -> now")
+    for label, (ms, heavy) in after.items():
+        old_ms, old_heavy = before[label]
+        print(
+            f"{label:<12} {old_ms:7.1f} ms {ms:7.1f} ms   x{old_ms / ms:4.1f}   "
+            f"{' '.join(old_heavy) or '-'} -> {' '.join(heavy) or '-'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Batch triage: inspect_many() over a folder of mixed advices against the
+account gate parse_advice() runs (pdfplumber open plus page-1 extraction).
+
+The corpus mixes VCC and UKM advices of 1..--max-pages pages with files for an
+unknown account, truncated files, scanned (image-only) advices and files whose
+page-1 content uses a /Filter pdfminer does not implement. Triage must accept
+and reject exactly the files the gate does, without raising.
+
+    python -m benchmarks.bench_triage [--files 300] [--max-pages 60] [--workers 8]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_advice import advice_rows, build_pdf
+from payment_advice.parser import InvalidAdviceError, open_advice
+from payment_advice.triage import OK, inspect_many
+
+CORPUS_PROFILES = [("30305409", "VCC"), ("30300689", "UKM")]
+
+
+def write_corpus(folder: str, files: int, max_pages: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    paths = []
+    for n in range(files):
+        account, prefix = CORPUS_PROFILES[n % len(CORPUS_PROFILES)]
+        kind = rng.random()
+        if kind < 0.08:
+            account = "10000001"
+        pages = advice_rows(rng.randint(1, max_pages), account=account, prefix=prefix, seed=n)
+        data = build_pdf(pages[:2], scanned={0, 1}) if 0.08 <= kind < 0.12 else build_pdf(pages)
+        if 0.12 <= kind < 0.16:
+            data = data[: len(data) // 3]
+        elif 0.16 <= kind < 0.19:
+            # The first stream written is page 1's content.
+            data = data.replace(b"<< /Length", b"<< /Filter /UnknownDecode /Length", 1)
+        path = os.path.join(folder, f"advice_{n:04d}.pdf")
+        with open(path, "wb") as fh:
+            fh.write(data)
+        paths.append(path)
+    return paths
+
+
+def gate_status(path: str) -> str:
+    try:
+        with open_advice(path, prefilter=False):
+            return OK
+    except InvalidAdviceError:
+        return "REJECTED"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--max-pages", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=8, help="Triage threads")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_corpus(folder, args.files, args.max_pages)
+        total_pages = 0
+
+        start = time.perf_counter()
+        gate = [gate_status(path) for path in paths]
+        gate_s = time.perf_counter() - start
+
+        timings = {}
+        for workers in (1, args.workers):
+            start = time.perf_counter()
+            infos = inspect_many(paths, workers=workers)
+            timings[workers] = time.perf_counter() - start
+        total_pages = sum(info.pages for info in infos)
+
+    disagree = [info.file_name for info, status in zip(infos, gate) if info.status != status]
+    rejected = sum(info.status != OK for info in infos)
+    scanned = sum(info.scanned for info in infos)
+    print(f"{len(paths)} files, {total_pages} pages: {rejected} rejected ({scanned} scanned)")
+    print(f"account gate (pdfplumber) {gate_s:6.2f}s")
+    for workers, seconds in timings.items():
+        print(f"triage, {workers} thread(s)  {seconds:6.2f}s   x{gate_s / seconds:.1f}")
+    print(f"verdicts differing from the gate: {len(disagree)} {disagree[:5]}")
+    return 1 if disagree else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
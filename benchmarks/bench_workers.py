@@ -0,0 +1,41 @@
+"""
+Page extraction wall-clock for 1, 2, 4 and 8 workers on a synthetic 500-page advice.
+
+    python -m benchmarks.bench_workers [--pages 500]
+"""
+import argparse
+import time
+from io import BytesIO
+
+import pdfplumber
+
+from benchmarks.synthetic_advice import synthetic_advice
+from payment_advice.extract import iter_page_texts
+
+
+def run(pdf_bytes: bytes, workers: int):
+    start = time.perf_counter()
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        page1_text = pdf.pages[0].extract_text() or ""
+        texts = list(iter_page_texts(pdf, page1_text, pdf_bytes, workers))
+    return time.perf_counter() - start, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    pdf_bytes = synthetic_advice(args.pages)
+    baseline = None
+    for workers in args.workers:
+        elapsed, texts = run(pdf_bytes, workers)
+        if baseline is None:
+            baseline = (elapsed, texts)
+        same = "identical" if texts == baseline[1] else "MISMATCH"
+        print(f"workers={workers:<2d} {elapsed:8.2f}s  speedup x{baseline[0] / elapsed:4.2f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
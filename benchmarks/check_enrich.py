@@ -0,0 +1,88 @@
+"""
+Import Name enrichment check: the column normalisers must give exactly what
+normalize_invoice() / normalize_state() give per value, and the cached index
+must enrich like the original two-merge add_import_name(), including ledger
+states written with non-breaking spaces and tabs as Excel exports do.
+
+    python -m benchmarks.check_enrich [--pages 20]
+"""
+import argparse
+import random
+import sys
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_advice import advice_rows, build_pdf, synthetic_ledger
+from payment_advice import parse_advice
+from payment_advice.aggregate import SUMMARY_COLUMNS
+from payment_advice.cache import ResultCache
+from payment_advice.enrich import (
+    load_import_name_index, normalize_invoice, normalize_invoice_series, normalize_state, normalize_state_series,
+)
+
+AWKWARD = [
+    "Tamil\xa0Nadu", "TAMIL NADU", " kerala\t", "Karnataka\n", "Delhi\xa0 ", "a  b", "ß", "",
+    "vcc /24-25/ 00001", None, np.nan, pd.NA, 1, 1.0,
+]
+
+
+def legacy_add_import_name(pivot_df, ledger_df, state_df):
+    # add_import_name() before the index: per-row .map() normalisation and two merges.
+    ledger_df = ledger_df.copy()
+    ledger_df['__INV_JOIN__'] = ledger_df['Invoice Number'].map(normalize_invoice)
+    ledger_df['__STATE_JOIN__'] = ledger_df['Ship To (State)'].map(normalize_state)
+    state_df = state_df.copy()
+    state_df['__STATE_JOIN__'] = state_df['STATE NAME'].map(normalize_state)
+    state_df = state_df[['__STATE_JOIN__', 'IMPORT NAME']].drop_duplicates()
+    enriched_df = pivot_df.copy()
+    enriched_df['__INV_JOIN__'] = enriched_df['Invoice Number'].map(normalize_invoice)
+    tmp = pd.merge(enriched_df, ledger_df[['__INV_JOIN__', '__STATE_JOIN__']].drop_duplicates(),
+                   on='__INV_JOIN__', how='left')
+    tmp = pd.merge(tmp, state_df, on='__STATE_JOIN__', how='left')
+    tmp.rename(columns={'IMPORT NAME': 'Import Name'}, inplace=True)
+    return tmp[['Invoice Number', 'Import Name'] + [c for c in SUMMARY_COLUMNS if c != 'Invoice Number']]
+
+
+def awkward_states(ledger_df, seed: int = 0):
+    # The same states as an Excel export may spell them: NBSP, tabs, stray padding.
+    rng = random.Random(seed)
+    spellings = [lambda s: s.replace(" ", "\xa0"), lambda s: s.replace(" ", "\t"), lambda s: f" {s}\xa0", str.upper]
+    ledger_df = ledger_df.copy()
+    ledger_df['Ship To (State)'] = [rng.choice(spellings)(s) for s in ledger_df['Ship To (State)']]
+    return ledger_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+
+    checks = {}
+    for dtype in ("object", "str"):
+        values = pd.Series([v for v in AWKWARD if dtype == "object" or isinstance(v, str) or v is None], dtype=dtype)
+        checks[f"normalize_state_series ({dtype})"] = (
+            normalize_state_series(values).tolist() == [normalize_state(v) for v in values])
+        checks[f"normalize_invoice_series ({dtype})"] = (
+            normalize_invoice_series(values).tolist() == [normalize_invoice(v) for v in values])
+
+    rows = advice_rows(args.pages, seed=9)
+    pivot_df = parse_advice(build_pdf(rows)).pivot
+    ledger_df, state_df = synthetic_ledger(rows, seed=9)
+    ledger_df = awkward_states(ledger_df, seed=9)
+    ledger_csv = BytesIO(ledger_df.to_csv(index=False).encode("utf-8"))
+    state_csv = BytesIO(state_df.to_csv(index=False).encode("utf-8"))
+    enriched = load_import_name_index(ledger_csv, state_csv, cache=ResultCache()).apply(pivot_df)
+    legacy = legacy_add_import_name(pivot_df, ledger_df.astype(str), state_df.astype(str))
+    checks["index matches the two-merge enrichment"] = (
+        enriched['Import Name'].astype(object).tolist() == legacy['Import Name'].astype(object).tolist())
+    checks["NBSP / tab states matched"] = enriched['Import Name'].notna().sum() >= 0.9 * len(enriched)
+
+    for name, ok in checks.items():
+        print(f"{name:<42} {'ok' if ok else 'FAIL'}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Service smoke check through Starlette's test client (needs starlette and httpx):
+- an upload is parsed to completion and its summary matches parse_advice();
+- the same upload again is answered from the parse cache;
+- an advice for an unknown account is rejected, and its result is a 422;
+- uploads beyond a full queue get 503 with Retry-After;
+- uploads over --max-upload-mb get 413, chunked ones (no Content-Length) included.
+
+    python -m benchmarks.check_service [--pages 10]
+"""
+import argparse
+import asyncio
+import importlib.util
+import sys
+import time
+
+from benchmarks.synthetic_advice import synthetic_advice
+from payment_advice import parse_advice
+
+CHUNK = 64 * 1024
+
+
+def wait_for(client, job_id: str, timeout: float = 120.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/advices/{job_id}").json()
+        if job["status"] not in ("queued", "running") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+async def chunked_upload(app, total: int):
+    """
+    POSTs `total` bytes as a chunked body (no Content-Length) straight to the
+    ASGI app; returns (status, chunks the app pulled before answering).
+    """
+    pulled = 0
+    status = []
+
+    async def receive():
+        nonlocal pulled
+        pulled += 1
+        return {"type": "http.request", "body": bytes(CHUNK), "more_body": pulled * CHUNK < total}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    scope = {"type": "http", "method": "POST", "path": "/advices", "query_string": b"",
+             "headers": [(b"transfer-encoding", b"chunked")]}
+    await app(scope, receive, send)
+    return status[0], pulled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=10)
+    args = parser.parse_args()
+    if importlib.util.find_spec("starlette") is None or importlib.util.find_spec("httpx") is None:
+        print("Service check needs starlette and httpx", file=sys.stderr)
+        return 2
+    from starlette.testclient import TestClient
+
+    from payment_advice.service import create_app
+
+    checks = {}
+    pdf = synthetic_advice(args.pages, seed=21)
+    with TestClient(create_app(workers=1, max_queue=1, max_upload_mb=1)) as client:
+        response = client.post("/advices?name=advice.pdf", content=pdf)
+        job = wait_for(client, response.json()["job_id"])
+        summary = client.get(f"/advices/{job['job_id']}/result").json()["summary"]
+        checks["upload parsed"] = response.status_code == 202 and job["status"] == "done"
+        checks["summary matches parse_advice"] = len(summary) == len(parse_advice(pdf).pivot)
+
+        again = client.post("/advices", content=pdf).json()
+        checks["repeat upload served from cache"] = again["status"] == "done"
+
+        response = client.post("/advices", content=synthetic_advice(2, account="10000001", seed=22))
+        job = wait_for(client, response.json()["job_id"])
+        result = client.get(f"/advices/{job['job_id']}/result")
+        checks["unknown account rejected"] = job["status"] == "rejected" and "matches no vendor profile" in job["error"]
+        checks["rejected result is 422"] = result.status_code == 422
+
+        # One job running and one queued fill a queue of one; distinct files miss the cache.
+        responses = [client.post("/advices", content=synthetic_advice(4 * args.pages, seed=30 + n)) for n in range(4)]
+        full = [r for r in responses if r.status_code == 503]
+        checks["full queue answers 503"] = len(full) >= 2 and all(r.headers.get("Retry-After") for r in full)
+
+        big = b"%PDF-1.4\n" + bytes(2 * 1024 * 1024)
+        checks["oversized upload answers 413"] = client.post("/advices", content=big).status_code == 413
+        checks["oversized multipart upload 413"] = client.post(
+            "/advices", files={"file": ("big.pdf", big, "application/pdf")}).status_code == 413
+        small = client.post("/advices", files={"file": ("small.pdf", synthetic_advice(1, seed=40), "application/pdf")})
+        checks["multipart upload accepted"] = small.status_code in (202, 503)
+
+    status, pulled = asyncio.run(chunked_upload(create_app(workers=1, max_upload_mb=1), 8 * 1024 * 1024))
+    checks["chunked upload cut off with 413"] = status == 413 and pulled * CHUNK <= 1024 * 1024 + 2 * CHUNK
+
+    for name, ok in checks.items():
+        print(f"{name:<34} {'ok' if ok else 'FAIL'}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+InvoiceStore check: two overlapping advices ingested into a fresh store must
+give the same cumulative pivot as parsing one advice holding all their pages,
+and re-ingesting an advice must be skipped without parsing.
+
+    python -m benchmarks.check_store [--pages 12] [--overlap 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic_advice import advice_rows, build_pdf
+from payment_advice import InvoiceStore, parse_advice
+
+HEADER_ROWS = 4
+
+
+def same_summary(a, b) -> bool:
+    a, b = a.reset_index(drop=True), b.reset_index(drop=True)
+    if list(a.columns) != list(b.columns) or len(a) != len(b):
+        return False
+    for column in a.columns:
+        if a[column].dtype.kind == "f":
+            if not np.allclose(a[column].to_numpy(), b[column].to_numpy(), rtol=0, atol=0.005):
+                return False
+        elif a[column].astype(str).tolist() != b[column].astype(str).tolist():
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=12, help="Pages across both advices")
+    parser.add_argument("--overlap", type=int, default=3, help="Pages carried by both advices")
+    args = parser.parse_args()
+
+    pages = advice_rows(args.pages, seed=5)
+    cut = (args.pages + args.overlap) // 2
+    first = build_pdf(pages[:cut])
+    # The second advice repeats the last --overlap pages of the first under its own page-1 header.
+    rest = pages[cut - args.overlap:]
+    second = build_pdf([pages[0][:HEADER_ROWS] + rest[0]] + rest[1:])
+
+    checks = {}
+    with tempfile.TemporaryDirectory() as folder:
+        with InvoiceStore(os.path.join(folder, "invoices.db")) as store:
+            a = store.ingest(first, file_name="first.pdf")
+            b = store.ingest(second, file_name="second.pdf")
+            again = store.ingest(first, file_name="first-copy.pdf")
+            checks["both advices ingested"] = a["status"] == b["status"] == "ingested"
+            checks["overlapping entries counted once"] = b["rows_seen"] > 0
+            checks["re-ingest skipped"] = again["status"] == "skipped" and again["advice_id"] == a["advice_id"]
+            checks["pivot matches one-advice parse"] = same_summary(store.pivot(), parse_advice(build_pdf(pages)).pivot)
+            checks["advices listed"] = store.advices()["file_name"].tolist() == ["first.pdf", "second.pdf"]
+
+    for name, ok in checks.items():
+        print(f"{name:<34} {'ok' if ok else 'FAIL'}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+End-to-end benchmark suite with golden-summary checks.
+
+For each vendor prefix and page count, a synthetic advice is parsed,
+aggregated, enriched against a synthetic ledger and exported to XLSX. Stage
+timings come from payment_advice.instrument. The invoice summary is compared
+with benchmarks/golden/<profile>_<pages>.json, so performance work cannot
+silently change totals. The fixtures reconcile except for SHORT_PAID_RATE of
+invoices, paid short on purpose, which the golden mismatch count pins.
+
+    python -m benchmarks.run_suite [--pages 10 100 1000] [--profiles vcc ukm] [--update-golden]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from io import BytesIO
+
+from benchmarks.synthetic_advice import advice_rows, build_pdf, synthetic_ledger
+from payment_advice import get_profile, parse_advice
+from payment_advice.cache import ResultCache
+from payment_advice.enrich import load_import_name_index
+from payment_advice.export import export_bytes
+from payment_advice.instrument import collect
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+STAGES = {
+    "parse": ("pdf_open", "extract_text", "parse_lines", "build_frame"),
+    "aggregate": ("aggregate",),
+    "enrich": ("ledger_read", "ledger_index", "enrich"),
+    "export": ("export_xlsx",),
+}
+
+SHORT_PAID_RATE = 0.02
+
+TOTAL_COLUMNS = [
+    'Final Paid Amount', 'TDS', 'Invoice Amount', 'GST Adjustment', 'Payment Amount', 'Debit Note',
+    'Expected Paid', 'Unexplained Delta',
+]
+
+
+def summarize(result, enriched_df) -> dict:
+    """
+    What the golden file pins: counts, column totals and a digest of the summary table.
+    """
+    pivot = result.pivot
+    table = pivot.to_csv(index=False, float_format="%.2f").encode("utf-8")
+    return {
+        "invoices": int(len(pivot)),
+        "rows": int(len(result.raw)),
+        "tds_captured": int(len(result.tds_map_signed)),
+        "totals": {c: round(float(pivot[c].sum()), 2) for c in TOTAL_COLUMNS},
+        "mismatches": int(pivot['Mismatch'].sum()),
+        "import_name_matched": int(enriched_df['Import Name'].notna().sum()),
+        "summary_sha256": hashlib.sha256(table).hexdigest(),
+    }
+
+
+def run_case(profile_key: str, pages: int) -> tuple:
+    profile = get_profile(profile_key)
+    rows = advice_rows(pages, account=profile.account, prefix=profile_key.upper(), seed=pages,
+                       short_paid_rate=SHORT_PAID_RATE)
+    pdf_bytes = build_pdf(rows)
+    ledger_df, state_df = synthetic_ledger(rows, seed=pages)
+    ledger_csv = BytesIO(ledger_df.to_csv(index=False).encode("utf-8"))
+    state_csv = BytesIO(state_df.to_csv(index=False).encode("utf-8"))
+
+    with collect(f"{profile_key}_{pages}") as stats:
+        result = parse_advice(pdf_bytes, profile)
+        enriched_df = load_import_name_index(ledger_csv, state_csv, cache=ResultCache()).apply(result.pivot)
+        export_bytes(enriched_df, result.raw, "xlsx")
+
+    timings = {stage: sum(stats.spans.get(s, 0.0) for s in spans) for stage, spans in STAGES.items()}
+    timings["total"] = stats.total
+    return summarize(result, enriched_df), timings
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--profiles", nargs="+", default=["vcc", "ukm"])
+    parser.add_argument("--update-golden", action="store_true", help="Rewrite the golden files from this run")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    print(f"{'case':<10} {'parse':>8} {'aggregate':>10} {'enrich':>8} {'export':>8} {'total':>8}  golden")
+    for profile_key in args.profiles:
+        for pages in args.pages:
+            case = f"{profile_key}_{pages}"
+            summary, t = run_case(profile_key, pages)
+            golden_path = os.path.join(GOLDEN_DIR, f"{case}.json")
+            if args.update_golden:
+                os.makedirs(GOLDEN_DIR, exist_ok=True)
+                with open(golden_path, "w", encoding="utf-8") as fh:
+                    json.dump(summary, fh, indent=2, sort_keys=True)
+                    fh.write("\n")
+                status = "updated"
+            elif not os.path.exists(golden_path):
+                status = "missing"
+            else:
+                with open(golden_path, encoding="utf-8") as fh:
+                    expected = json.load(fh)
+                status = "ok" if expected == summary else "MISMATCH"
+                if status == "MISMATCH":
+                    failures += 1
+                    diff = {k: (expected.get(k), v) for k, v in summary.items() if expected.get(k) != v}
+                    status += f" {diff}"
+            print(
+                f"{case:<10} {t['parse']:8.2f} {t['aggregate']:10.3f} {t['enrich']:8.3f} "
+                f"{t['export']:8.2f} {t['total']:8.2f}  {status}",
+                flush=True,
+            )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Synthetic RIL-style payment advice PDFs for benchmarks.
+
+Writes a plain PDF (Helvetica text in fixed table columns) without any extra
+dependency, so pdfplumber extracts the same lines the real advices produce.
+Scanned pages are rendered with Pillow, which pdfplumber already depends on.
+"""
+import random
+import re
+import zlib
+
+LINES_PER_PAGE = 60
+PAGE_WIDTH, PAGE_HEIGHT = 842, 595
+FONT_SIZE = 7
+LEADING = 9
+# Pixels per point for scanned pages (2 is 144 dpi).
+SCAN_SCALE = 2
+
+# Table columns: (x, align). Amounts are right-aligned on their column edge.
+DOC_COL = (30, "left")
+INVOICE_COL = (110, "left")
+INV_AMT_COL = (300, "right")
+PAY_AMT_COL = (400, "right")
+
+# Marks where an amount is drawn as two separate words.
+SPLIT_MARK = "\t"
+SPLIT_GAP = 4
+
+# Helvetica advance widths (1/1000 em) for the characters used in amounts.
+_HELVETICA_WIDTHS = {",": 278, ".": 278, "-": 333, " ": 278}
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _amount(value: float, trailing_minus: bool = False) -> str:
+    s = f"{abs(value):,.2f}"
+    if value < 0:
+        s = s + "-" if trailing_minus else "-" + s
+    return s
+
+
+def _text_width(text: str) -> float:
+    return sum(_HELVETICA_WIDTHS.get(ch, 556) for ch in text) * FONT_SIZE / 1000
+
+
+def advice_rows(pages: int, account: str = "30305409", prefix: str = "VCC", seed: int = 0,
+                split_amount_rate: float = 0.0, invoices_per_page: int = None, short_paid_rate: float = 0.0):
+    """
+    Returns a list of pages, each a list of rows; a row is a list of (column, text) cells.
+    Pages hold about LINES_PER_PAGE lines unless invoices_per_page is given.
+    With split_amount_rate > 0, that share of invoice amounts is drawn as two
+    words ("422," and "988.82") the way some advices drift. Every invoice
+    reconciles except a short_paid_rate share, paid short with no debit note.
+    """
+    rng = random.Random(seed)
+    split_rng = random.Random(seed + 1)
+    short_rng = random.Random(seed + 2)
+
+    def amount_cell(value):
+        text = _amount(value)
+        if "," in text and split_rng.random() < split_amount_rate:
+            head, tail = text.split(",", 1)
+            return head + "," + SPLIT_MARK + tail
+        return text
+
+    out = []
+    doc_no = 5100000000
+    inv_seq = 0
+    for page_no in range(pages):
+        rows = []
+        if page_no == 0:
+            rows += [
+                [(DOC_COL, "RELIANCE INDUSTRIES LIMITED")],
+                [(DOC_COL, "PAYMENT ADVICE")],
+                [(DOC_COL, f"Your A/c with us : {account}")],
+                [(DOC_COL, "Doc No"), (INVOICE_COL, "Invoice No"),
+                 (INV_AMT_COL, "Invoice Amt"), (PAY_AMT_COL, "Payment Amt")],
+            ]
+        invoices = 0
+        while (len(rows) < LINES_PER_PAGE - 6) if invoices_per_page is None else (invoices < invoices_per_page):
+            invoices += 1
+            inv_seq += 1
+            doc_no += 1
+            inv_no = f"{prefix}/24-25/{inv_seq:05d}"
+            inv_amt = round(rng.uniform(5_000, 500_000), 2)
+            tds = round(inv_amt * 0.02, 2)
+            day = rng.randint(1, 28)
+            debit = round(rng.uniform(100, 5_000), 2) if rng.random() < 0.2 else 0.0
+            # The payment is net of TDS and of any debit note, so the invoice reconciles
+            # unless it is one of the short_paid_rate share paid short without a reason.
+            short = round(short_rng.uniform(1, 500), 2) if short_rng.random() < short_paid_rate else 0.0
+            pay_amt = round(inv_amt - tds - debit - short, 2)
+            rows.append([(DOC_COL, str(doc_no)), (INVOICE_COL, inv_no),
+                          (INV_AMT_COL, amount_cell(inv_amt)), (PAY_AMT_COL, _amount(pay_amt))])
+            rows.append([(DOC_COL, f"{day:02d}.04.2024"), (INVOICE_COL, f"{day:02d}.04.2024")])
+            if debit:
+                rows.append([(INVOICE_COL, f"Short payment deducted Rs.{_amount(debit)} vide DN")])
+            if rng.random() < 0.3:
+                gst = round(inv_amt * 0.18, 2) * (1 if rng.random() < 0.5 else -1)
+                doc_no += 1
+                rows.append([(DOC_COL, str(doc_no)), (INVOICE_COL, inv_no),
+                              (PAY_AMT_COL, _amount(gst, trailing_minus=True))])
+                rows.append([(DOC_COL, f"{day:02d}.04.2024"), (INVOICE_COL, f"{day:02d}.04.2024")])
+            rows.append([(INVOICE_COL, "TDS Amount"), (PAY_AMT_COL, _amount(-tds, trailing_minus=True))])
+        out.append(rows)
+    return out
+
+
+def advice_lines(pages: int, account: str = "30305409", prefix: str = "VCC", seed: int = 0,
+                 split_amount_rate: float = 0.0, invoices_per_page: int = None):
+    """
+    Returns a list of pages, each a list of text lines as pdfplumber extracts them.
+    """
+    return [
+        [" ".join(text for _, text in row).replace(SPLIT_MARK, " ") for row in rows]
+        for rows in advice_rows(pages, account=account, prefix=prefix, seed=seed,
+                                split_amount_rate=split_amount_rate, invoices_per_page=invoices_per_page)
+    ]
+
+
+def boilerplate_rows(seed: int = 0):
+    """
+    A page with no invoice rows or TDS lines: cover, remittance summary, terms or
+    bank details, with dates, amounts and reference numbers of its own.
+    """
+    rng = random.Random(seed)
+    kind = seed % 4
+    day = rng.randint(1, 28)
+    if kind == 0:
+        lines = ["RELIANCE INDUSTRIES LIMITED", "Cover Sheet", f"Generated on {day:02d}.04.2024 {day:02d}.04.2024"]
+    elif kind == 1:
+        lines = ["Remittance Summary", f"Payment Date {day:02d}.04.2024"]
+        lines += [f"Batch {n + 1} cleared {day:02d}.04.2024 total INR {_amount(rng.uniform(1e5, 1e7))}"
+                  for n in range(LINES_PER_PAGE - 4)]
+    elif kind == 2:
+        lines = ["Terms and Conditions"]
+        lines += [f"{n + 1}. Payments are released against accepted invoices net of deductions as per "
+                  f"clause {rng.randint(1, 40)} of the agreement dated {day:02d}.04.2024."
+                  for n in range(LINES_PER_PAGE - 3)]
+    else:
+        # A reference that looks like an invoice number keeps this page a candidate.
+        lines = ["Bank Details", f"UTR {rng.randint(10**9, 10**10)} value date {day:02d}.04.2024",
+                 f"R{rng.randint(1000, 9999)} settled in full", "Deductions shown against each invoice"]
+    return [[(DOC_COL, line)] for line in lines]
+
+
+def with_boilerplate(pages_rows, every: int = 3, seed: int = 0):
+    """
+    Inserts a boilerplate page after every `every` pages (page 1 stays first).
+    """
+    out = []
+    for n, rows in enumerate(pages_rows, start=1):
+        out.append(rows)
+        if n % every == 0:
+            out.append(boilerplate_rows(seed + n))
+    return out
+
+
+def _placements(row):
+    # (x, text) of every string a row draws, in drawing order.
+    for (x, align), text in row:
+        if align == "left":
+            yield x, text.replace(SPLIT_MARK, " ")
+            continue
+        # Right-aligned: split parts right to left from the column edge.
+        for part in reversed(text.split(SPLIT_MARK)):
+            x -= _text_width(part)
+            yield x, part
+            x -= SPLIT_GAP
+
+
+def _glyph_width(text: str) -> float:
+    from pdfminer.fontmetrics import FONT_METRICS
+
+    widths = FONT_METRICS["Helvetica"][1]
+    return sum(widths.get(ch, 556) for ch in text) * FONT_SIZE / 1000
+
+
+def _pieces(x, text):
+    # Words drawn one by one (each keeping its trailing space), with a letter
+    # prefix such as "VCC" in "VCC/24-25/00001" split off its number.
+    for word in re.findall(r"\S+\s*|\s+", text):
+        for piece in re.findall(r"^[A-Za-z]+(?=[/\d-])|.+", word, re.DOTALL):
+            yield x, piece
+            x += _glyph_width(piece)
+
+
+def _text_stream(rows, height, hex_tj: bool = False, out_of_order: bool = False) -> bytes:
+    ops = [f"BT /F1 {FONT_SIZE} Tf"]
+    y = height - 30
+    for row in rows:
+        cells = list(_placements(row))
+        if out_of_order:
+            # Every word as its own string, last word first: reading order then
+            # only comes from the positions.
+            cells = [piece for x, text in cells for piece in _pieces(x, text)][::-1]
+        if not hex_tj:
+            for x, text in cells:
+                ops.append(f"1 0 0 1 {x:.2f} {y} Tm ({_pdf_escape(text)}) Tj")
+        elif cells:
+            # One TJ array of hex strings per row, with kerning offsets as the gaps
+            # between cells, as some generators write tables.
+            cells.sort()
+            items = []
+            pen = cells[0][0]
+            for x, text in cells:
+                if items:
+                    items.append(f"{(pen - x) * 1000 / FONT_SIZE:.0f}")
+                items.append(f"<{text.encode('latin-1').hex().upper()}>")
+                pen = x + _glyph_width(text)
+            ops.append(f"1 0 0 1 {cells[0][0]:.2f} {y} Tm [{' '.join(items)}] TJ")
+        y -= LEADING
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def _page_image(rows, height, scale: float = SCAN_SCALE) -> bytes:
+    # The rows drawn at SCAN_SCALE pixels per point, as a Flate-compressed grayscale image XObject.
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new("L", (round(PAGE_WIDTH * scale), round(height * scale)), 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=FONT_SIZE * scale)
+    y = height - 30
+    for row in rows:
+        top = (height - y - FONT_SIZE) * scale
+        for (x, align), text in row:
+            text = text.replace(SPLIT_MARK, " ")
+            left = x * scale if align == "left" else x * scale - draw.textlength(text, font=font)
+            draw.text((left, top), text, fill=0, font=font)
+        y -= LEADING
+    data = zlib.compress(image.tobytes())
+    return (
+        b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+        b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n" % (image.width, image.height, len(data))
+        + data + b"\nendstream"
+    )
+
+
+def build_pdf(pages_rows, scanned=(), hex_tj=(), out_of_order=()) -> bytes:
+    """
+    Renders pages of rows (lists of (column, text) cells) into PDF bytes.
+    Pages whose index is in `scanned` carry a page-sized image of the same
+    rows and no text layer, like a scanned advice. Pages in `hex_tj` draw
+    each row as one kerned TJ array of hex strings; pages in `out_of_order`
+    draw each word separately, from the end of the row backwards.
+    """
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    n_scanned = sum(1 for index in range(len(pages_rows)) if index in scanned)
+    pages_id = len(objects) + 1 + 2 * len(pages_rows) + n_scanned
+    kids = []
+    for index, rows in enumerate(pages_rows):
+        # Long pages grow instead of running off the bottom edge.
+        height = max(PAGE_HEIGHT, 60 + len(rows) * LEADING)
+        if index in scanned:
+            image = add(_page_image(rows, height))
+            stream = f"q {PAGE_WIDTH} 0 0 {height} 0 0 cm /Im1 Do Q".encode("latin-1")
+            resources = f"/XObject << /Im1 {image} 0 R >>"
+        else:
+            stream = _text_stream(rows, height, hex_tj=index in hex_tj, out_of_order=index in out_of_order)
+            resources = f"/Font << /F1 {font} 0 R >>"
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH} {height}] "
+            f"/Resources << {resources} >> /Contents {content} 0 R >>".encode("latin-1")
+        ))
+    kid_refs = " ".join(f"{k} 0 R" for k in kids)
+    add(f"<< /Type /Pages /Kids [{kid_refs}] /Count {len(kids)} >>".encode("latin-1"))
+    catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode("latin-1"))
+
+    buf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, start=1):
+        offsets.append(len(buf))
+        buf += b"%d 0 obj\n" % n + body + b"\nendobj\n"
+    xref = len(buf)
+    buf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        buf += b"%010d 00000 n \n" % off
+    buf += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(buf)
+
+
+def synthetic_advice(pages: int, account: str = "30305409", prefix: str = "VCC", seed: int = 0,
+                     split_amount_rate: float = 0.0, invoices_per_page: int = None) -> bytes:
+    return build_pdf(advice_rows(pages, account=account, prefix=prefix, seed=seed,
+                                 split_amount_rate=split_amount_rate, invoices_per_page=invoices_per_page))
+
+
+def synthetic_ledger(pages_rows, states=("TAMIL NADU", "KERALA", "KARNATAKA", "DELHI"), seed: int = 0):
+    """
+    E-Invoice Ledger and State Details tables covering the invoices in pages_rows
+    (minus a few, so some invoices stay unmatched). Returns (ledger_df, state_df).
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    invoices = sorted({
+        row[1][1] for rows in pages_rows for row in rows
+        if len(row) >= 3 and row[1][0] == INVOICE_COL and row[0][0] == DOC_COL
+        and not row[1][1].startswith("Invoice")
+    })
+    kept = [inv for inv in invoices if rng.random() > 0.05]
+    ledger_df = pd.DataFrame({
+        'Invoice Number': kept,
+        'Ship To (State)': [rng.choice(states).title() for _ in kept],
+        'Taxable Value': [round(rng.uniform(1_000, 500_000), 2) for _ in kept],
+    })
+    state_df = pd.DataFrame({
+        'STATE NAME': list(states),
+        'IMPORT NAME': [f"{s.split()[0]} IMPORTS" for s in states],
+    })
+    return ledger_df, state_df
@@ -0,0 +1,37 @@
+"""
+Shared, UI-free building blocks for the RIL Payment Advice parsers.
+
+Names are resolved on first use, so `import payment_advice` stays cheap and
+pandas / pdfplumber load only when something that needs them is touched.
+"""
+import importlib
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    "ResultCache": ".cache", "cached_parse_advice": ".cache",
+    "InvalidAdviceError": ".parser", "ParseResult": ".parser", "parse_advice": ".parser",
+    "UKM": ".profiles", "VCC": ".profiles", "Profile": ".profiles", "get_profile": ".profiles",
+    "load_profiles": ".profiles", "profile_for_account": ".profiles",
+    "InvoiceStore": ".store",
+    "PivotAccumulator": ".stream", "iter_rows": ".stream", "summarize_advice": ".stream",
+    "AdviceInfo": ".triage", "inspect_advice": ".triage", "inspect_many": ".triage",
+}
+
+__all__ = [
+    "AdviceInfo", "InvalidAdviceError", "InvoiceStore", "ParseResult", "PivotAccumulator", "Profile", "ResultCache",
+    "UKM", "VCC", "cached_parse_advice", "get_profile", "inspect_advice", "inspect_many", "iter_rows",
+    "load_profiles", "parse_advice", "profile_for_account", "summarize_advice",
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,110 @@
+"""
+Per-invoice aggregation of the raw rows and payment reconciliation.
+
+Invoice numbers are grouped by integer codes (the raw frame carries them as a
+categorical), sums go through pandas' compensated group sum so totals match
+the old groupby().agg() bit for bit, and max / first are single ufunc passes.
+"""
+import numpy as np
+import pandas as pd
+
+from . import instrument
+
+SUMMARY_COLUMNS = [
+    'Invoice Number', 'Final Paid Amount', 'TDS',
+    'Invoice Amount', 'GST Adjustment', 'Payment Amount', 'Debit Note', 'Invoice Date',
+    'Expected Paid', 'Unexplained Delta', 'Mismatch'
+]
+
+# Deltas below one paisa are rounding, not a mismatch.
+RECONCILE_TOLERANCE = 0.01
+
+_SUM_COLUMNS = ['GST Adjustment', 'Payment Amount', 'Debit Note']
+
+
+def summary_frame(invoices, invoice_amount, gst_adjustment, payment_amount, tds_signed, debit_note,
+                  invoice_date) -> pd.DataFrame:
+    """
+    The invoice summary (SUMMARY_COLUMNS) from per-invoice aggregates.
+    Expected Paid is Invoice Amount less TDS and Debit Note, plus the GST
+    Adjustment: GST PAID and GST HOLD lines are explained, not a shortfall.
+    Unexplained Delta is what Final Paid Amount still falls short of it.
+    """
+    invoice_amount = np.asarray(invoice_amount, dtype=np.float64)
+    gst_adjustment = np.asarray(gst_adjustment, dtype=np.float64)
+    payment_amount = np.asarray(payment_amount, dtype=np.float64)
+    debit_note = np.asarray(debit_note, dtype=np.float64)
+    # Final paid amount: Payment + GST adjustments
+    final_paid = payment_amount + gst_adjustment
+    # Display TDS as absolute value ONLY in the summary output
+    tds = np.abs(np.asarray(tds_signed, dtype=np.float64))
+    expected = np.round(invoice_amount - tds - debit_note + gst_adjustment, 2)
+    delta = np.round(expected - final_paid, 2)
+    return pd.DataFrame({
+        'Invoice Number': pd.Index(invoices),
+        'Final Paid Amount': final_paid,
+        'TDS': tds,
+        'Invoice Amount': invoice_amount,
+        'GST Adjustment': gst_adjustment,
+        'Payment Amount': payment_amount,
+        'Debit Note': debit_note,
+        'Invoice Date': pd.Index(invoice_date),
+        'Expected Paid': expected,
+        'Unexplained Delta': delta,
+        'Mismatch': np.abs(delta) >= RECONCILE_TOLERANCE,
+    }, columns=SUMMARY_COLUMNS, copy=False)
+
+
+def invoice_codes(invoice_numbers: pd.Series):
+    """
+    Returns (codes, invoices): integer codes into the sorted unique invoice
+    numbers, -1 for missing. A categorical column's codes are reused.
+    """
+    if isinstance(invoice_numbers.dtype, pd.CategoricalDtype):
+        categories = invoice_numbers.cat.categories
+        order = categories.argsort()
+        rank = np.empty(len(order) + 1, dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        rank[-1] = -1
+        return rank[invoice_numbers.cat.codes.to_numpy()], categories.take(order)
+    return pd.factorize(invoice_numbers, sort=True)
+
+
+def build_pivot(df_all):
+    """
+    Aggregates the raw table (TDS_Signed already mapped) to the per-invoice summary.
+    """
+    with instrument.span("aggregate"):
+        return _build_pivot(df_all)
+
+
+def _build_pivot(df_all):
+    codes, invoices = invoice_codes(df_all['Invoice Number'])
+    n_rows = len(codes)
+    if n_rows and codes.min() < 0:
+        keep = codes >= 0
+        codes, df_all = codes[keep], df_all[keep]
+        n_rows = len(codes)
+
+    # First row of each invoice, and which codes occur at all.
+    first = np.full(len(invoices), n_rows, dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(n_rows))
+    present = first < n_rows
+    first = first[present]
+
+    def group_max(column):
+        out = np.full(len(invoices), np.nan)
+        np.fmax.at(out, codes, df_all[column].to_numpy(dtype=np.float64))
+        return out[present]
+
+    # Compensated sums in row order, as groupby().sum() always did.
+    sums = df_all[_SUM_COLUMNS].groupby(codes, sort=True).sum()
+    return summary_frame(
+        invoices[present],
+        group_max('Invoice Amount'),
+        sums['GST Adjustment'].to_numpy(),
+        sums['Payment Amount'].to_numpy(),
+        group_max('TDS_Signed'),
+        sums['Debit Note'].to_numpy(),
+        df_all['Invoice Date'].take(first),
+    )
@@ -0,0 +1,159 @@
+"""
+Content-hash cache for parse results.
+
+Results are keyed by SHA-256 of the PDF bytes, the vendor profile and
+PARSER_VERSION. An in-memory LRU sits in front of an optional on-disk
+pickle tier that is trimmed to a byte budget, oldest-used first.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+from . import instrument
+from .parser import PARSER_VERSION, _as_file, parse_advice
+from .profiles import load_profiles, registry_path
+
+
+def _profile_fingerprint(profile) -> str:
+    if profile is not None:
+        return f"{profile.key}|{profile.account}|{profile.invoice_pattern}"
+    # Auto-routing depends on the whole registry.
+    profiles = load_profiles(registry_path()).values()
+    return "auto|" + ";".join(f"{p.key}|{p.account}|{p.invoice_pattern}" for p in profiles)
+
+
+def cache_key(pdf_bytes: bytes, profile=None, engine: str = "text", ocr: bool = False) -> str:
+    h = hashlib.sha256(pdf_bytes)
+    h.update(b"\0" + _profile_fingerprint(profile).encode("utf-8"))
+    h.update(b"\0" + engine.encode("ascii"))
+    if ocr:
+        h.update(b"\0ocr")
+    h.update(b"\0" + PARSER_VERSION.encode("ascii"))
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of picklable results (parse results, ledger indexes).
+    Cached objects are shared, so callers must treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 32, directory: str = None, max_disk_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        result = self._disk_get(key)
+        if result is not None:
+            self._memory_put(key, result)
+        return result
+
+    def put(self, key: str, result):
+        self._memory_put(key, result)
+        self._disk_put(key, result)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _memory_put(self, key, result):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _disk_get(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                result = pickle.load(fh)
+            os.utime(path)
+            return result
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _disk_put(self, key, result):
+        if not self.directory:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(result, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+_default_cache = None
+
+
+def default_cache() -> ResultCache:
+    """
+    Process-wide cache. PAYMENT_ADVICE_CACHE_DIR enables the disk tier and
+    PAYMENT_ADVICE_CACHE_MB caps its size.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(
+            directory=os.environ.get("PAYMENT_ADVICE_CACHE_DIR") or None,
+            max_disk_bytes=int(os.environ.get("PAYMENT_ADVICE_CACHE_MB", "512")) * 1024 * 1024,
+        )
+    return _default_cache
+
+
+def cached_parse_advice(source, profile=None, workers: int = 1, cache: ResultCache = None, engine: str = "text",
+                        ocr: bool = False):
+    """
+    parse_advice() behind the content-hash cache.
+    """
+    cache = cache or default_cache()
+    _, pdf_bytes = _as_file(source)
+    key = cache_key(pdf_bytes, profile, engine, ocr)
+    result = cache.get(key)
+    if result is None:
+        instrument.add("parse_cache_miss")
+        result = parse_advice(pdf_bytes, profile, workers, engine, ocr=ocr)
+        cache.put(key, result)
+    else:
+        instrument.add("parse_cache_hit")
+    return result
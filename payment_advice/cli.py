@@ -0,0 +1,339 @@
+"""
+Command-line entry point.
+
+    python -m payment_advice batch ./inbox --out ./out --workers 8
+    python -m payment_advice inspect ./inbox --out triage.xlsx
+    python -m payment_advice ingest ./inbox --db advices.sqlite
+    python -m payment_advice report --db advices.sqlite --out month_end.xlsx
+    python -m payment_advice serve --port 8000 --workers 4
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+
+from . import instrument
+from .export import EXPORT_FORMATS, export_bytes, write_workbook
+from .ocr import ocr_available
+from .parser import ENGINES, InvalidAdviceError, parse_advice
+from .profiles import get_profile
+from .startup import process_pool
+from .store import InvoiceStore, advice_id, parse_records
+from .triage import REJECTED, inspect_many
+
+
+def process_file(path: str, out_dir: str, profile_key: str = None, engine: str = "text",
+                 fmt: str = "xlsx", profile_out: str = None, ocr: bool = False) -> dict:
+    """
+    Parses one advice and writes <out_dir>/<name>.<ext>. Never raises; failures
+    are reported in the returned record.
+    """
+    with instrument.collect(os.path.basename(path), profile_dir=profile_out):
+        return _process_file(path, out_dir, profile_key, engine, fmt, ocr)
+
+
+def _process_file(path, out_dir, profile_key, engine, fmt, ocr):
+    start = time.perf_counter()
+    record = {
+        'File': os.path.basename(path), 'Profile': '', 'Status': 'OK',
+        'Invoices': 0, 'Rows': 0, 'Mismatches': 0, 'Seconds': 0.0, 'Error': '', 'summary': None,
+    }
+    try:
+        profile = get_profile(profile_key) if profile_key else None
+        result = parse_advice(path, profile, engine=engine, ocr=ocr)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        ext = EXPORT_FORMATS[fmt][0]
+        with open(os.path.join(out_dir, f"{stem}.{ext}"), "wb") as fh:
+            fh.write(export_bytes(result.pivot, result.raw, fmt))
+        record.update(
+            Profile=result.profile.key, Invoices=len(result.pivot), Rows=len(result.raw),
+            Mismatches=int(result.pivot['Mismatch'].sum()),
+            summary=result.pivot,
+        )
+    except InvalidAdviceError as e:
+        record.update(Status='REJECTED', Error=str(e))
+    except Exception as e:
+        record.update(Status='FAILED', Error=f"{type(e).__name__}: {e}")
+    record['Seconds'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_batch(inbox: str, out_dir: str, workers: int = 1, profile_key: str = None, engine: str = "text",
+              fmt: str = "xlsx", profile_out: str = None, ocr: bool = False) -> list:
+    """
+    Processes every PDF in `inbox` concurrently and writes the per-file exports
+    plus batch_summary.xlsx. Returns the per-file records in file-name order.
+    """
+    paths = sorted(
+        os.path.join(inbox, name) for name in os.listdir(inbox)
+        if name.lower().endswith(".pdf")
+    )
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Files the account gate would refuse are reported without a pool task or a full open.
+    # With OCR, a scanned page 1 is left for the OCR pass to read.
+    records = []
+    accepted = []
+    profile = get_profile(profile_key) if profile_key else None
+    for path, info in zip(paths, inspect_many(paths, profile)):
+        if info.status == REJECTED and not (ocr and info.scanned):
+            records.append(_rejected_record(info))
+            _report(records[-1])
+        else:
+            accepted.append(path)
+    paths = accepted
+
+    if workers <= 1:
+        for path in paths:
+            records.append(process_file(path, out_dir, profile_key, engine, fmt, profile_out, ocr))
+            _report(records[-1])
+    else:
+        with process_pool(workers) as pool:
+            futures = [
+                pool.submit(process_file, path, out_dir, profile_key, engine, fmt, profile_out, ocr) for path in paths
+            ]
+            for future in as_completed(futures):
+                records.append(future.result())
+                _report(records[-1])
+    records.sort(key=lambda r: r['File'])
+
+    write_batch_summary(records, os.path.join(out_dir, "batch_summary.xlsx"))
+    return records
+
+
+def _rejected_record(info) -> dict:
+    return {
+        'File': info.file_name, 'Profile': '', 'Status': 'REJECTED', 'Invoices': 0, 'Rows': 0,
+        'Mismatches': 0, 'Seconds': info.seconds, 'Error': info.reason, 'summary': None,
+    }
+
+
+def write_batch_summary(records, path: str):
+    """
+    Writes a 'Files' sheet (status and timing per PDF) and a consolidated
+    'Final Summary' sheet with every parsed invoice tagged by its source file.
+    """
+    import pandas as pd
+
+    files_df = pd.DataFrame([{k: v for k, v in r.items() if k != 'summary'} for r in records])
+    summaries = [r['summary'].assign(**{'Source File': r['File']}) for r in records if r['summary'] is not None]
+    summary_df = pd.concat(summaries, ignore_index=True) if summaries else pd.DataFrame()
+    if not summary_df.empty:
+        summary_df = summary_df[['Source File'] + [c for c in summary_df.columns if c != 'Source File']]
+    write_workbook({'Files': files_df, 'Final Summary': summary_df}, path)
+
+
+def pdf_paths(inputs) -> list:
+    """
+    Expands files and folders into the sorted list of PDF paths they contain.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(os.path.join(item, name) for name in os.listdir(item) if name.lower().endswith(".pdf"))
+        else:
+            paths.append(item)
+    return sorted(paths)
+
+
+def run_ingest(inputs, db_path: str, workers: int = 1, profile_key: str = None, engine: str = "text",
+               ocr: bool = False) -> list:
+    """
+    Adds every advice not yet in the store at `db_path`. Already-ingested
+    files are recognised by content hash and not parsed again. New files are
+    parsed concurrently; rows are written by this process only.
+    """
+    records = []
+    with InvoiceStore(db_path) as store:
+        pending = []
+        for path in pdf_paths(inputs):
+            with open(path, "rb") as fh:
+                if store.has_advice(advice_id(fh.read())):
+                    records.append(_ingest_record(path, 'SKIPPED'))
+                    _report(records[-1])
+                else:
+                    pending.append(path)
+
+        if workers <= 1 or len(pending) <= 1:
+            for path in pending:
+                records.append(_store_parsed(store, path, *_parse_for_ingest(path, profile_key, engine, ocr)))
+                _report(records[-1])
+        else:
+            with process_pool(workers) as pool:
+                futures = {pool.submit(_parse_for_ingest, path, profile_key, engine, ocr): path for path in pending}
+                for future in as_completed(futures):
+                    records.append(_store_parsed(store, futures[future], *future.result()))
+                    _report(records[-1])
+    records.sort(key=lambda r: r['File'])
+    return records
+
+
+def run_inspect(inputs, workers: int = 8, profile_key: str = None, out: str = None) -> list:
+    """
+    Triage of every PDF from metadata and page 1 only (see triage.py).
+    Optionally writes the findings to a workbook at `out`.
+    """
+    profile = get_profile(profile_key) if profile_key else None
+    infos = inspect_many(pdf_paths(inputs), profile, workers)
+    for info in infos:
+        line = (
+            f"{info.status:<8} {info.pages:5d} pages  ~{info.estimated_rows:6d} rows  "
+            f"{info.profile or '-':<6} {info.file_name}"
+        )
+        flags = [flag for flag, on in (("encrypted", info.encrypted), ("scanned", info.scanned)) if on]
+        if flags:
+            line += f"  [{', '.join(flags)}]"
+        if info.reason:
+            line += f"  ({info.reason})"
+        print(line, flush=True)
+    if out:
+        import pandas as pd
+
+        write_workbook({'Triage': pd.DataFrame([info.to_dict() for info in infos])}, out)
+    return infos
+
+
+def _parse_for_ingest(path, profile_key, engine, ocr):
+    # Returns (parsed, status, error, seconds); never raises, like process_file().
+    start = time.perf_counter()
+    try:
+        return parse_records(path, profile_key, engine, ocr), 'OK', '', time.perf_counter() - start
+    except InvalidAdviceError as e:
+        return None, 'REJECTED', str(e), time.perf_counter() - start
+    except Exception as e:
+        return None, 'FAILED', f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def _store_parsed(store, path, parsed, status, error, seconds):
+    start = time.perf_counter()
+    record = _ingest_record(path, status, Error=error)
+    if parsed is not None:
+        outcome = store.add_records(*parsed)
+        record.update(
+            Profile=parsed[1], Status='OK' if outcome['status'] == 'ingested' else 'SKIPPED',
+            New=outcome['rows_new'], Seen=outcome['rows_seen'],
+        )
+    record['Seconds'] = round(seconds + time.perf_counter() - start, 3)
+    return record
+
+
+def _ingest_record(path, status, **fields):
+    record = {'File': os.path.basename(path), 'Profile': '', 'Status': status,
+              'New': 0, 'Seen': 0, 'Seconds': 0.0, 'Error': ''}
+    record.update(fields)
+    return record
+
+
+def _report(record):
+    line = f"{record['Status']:<8} {record['Seconds']:8.2f}s  {record['File']}"
+    if record['Error']:
+        line += f"  ({record['Error']})"
+    print(line, flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="payment-advice", description="RIL Payment Advice parser")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="Parse every PDF in a folder")
+    batch.add_argument("inbox", help="Folder containing payment advice PDFs")
+    batch.add_argument("--out", required=True, help="Folder for the output files")
+    batch.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Files parsed in parallel")
+    batch.add_argument("--profile", help="Force a vendor profile instead of routing by account number")
+    batch.add_argument("--engine", choices=ENGINES, default="text", help="Page text extraction engine")
+    batch.add_argument("--ocr", action="store_true", help="OCR scanned pages (needs pytesseract and tesseract)")
+    batch.add_argument("--format", choices=list(EXPORT_FORMATS), default="xlsx", help="Per-file export format")
+    batch.add_argument("--diagnostics", action="store_true", help="Log per-file stage timings as JSON to stderr")
+    batch.add_argument("--profile-out", help="Write a cProfile dump per file into this folder")
+
+    inspect = sub.add_parser("inspect", help="Screen PDFs from metadata and page 1, without parsing")
+    inspect.add_argument("inputs", nargs="+", help="PDF files or folders of PDFs")
+    inspect.add_argument("--workers", type=int, default=8, help="Files inspected in parallel (threads)")
+    inspect.add_argument("--profile", help="Check against this vendor profile instead of routing by account number")
+    inspect.add_argument("--out", help="Also write the findings to this workbook")
+
+    ingest = sub.add_parser("ingest", help="Add advices to a persistent invoice store")
+    ingest.add_argument("inputs", nargs="+", help="PDF files or folders of PDFs")
+    ingest.add_argument("--db", required=True, help="SQLite store file (created if missing)")
+    ingest.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Files parsed in parallel")
+    ingest.add_argument("--profile", help="Force a vendor profile instead of routing by account number")
+    ingest.add_argument("--engine", choices=ENGINES, default="text", help="Page text extraction engine")
+    ingest.add_argument("--ocr", action="store_true", help="OCR scanned pages (needs pytesseract and tesseract)")
+
+    report = sub.add_parser("report", help="Export the cumulative invoice summary from a store")
+    report.add_argument("--db", required=True, help="SQLite store file")
+    report.add_argument("--out", required=True, help="Output workbook path")
+
+    serve = sub.add_parser("serve", help="Run the HTTP ingestion service (needs starlette and uvicorn)")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    serve.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    serve.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Advices parsed in parallel")
+    serve.add_argument("--queue", type=int, default=64, help="Uploads allowed to wait before 503")
+    serve.add_argument("--max-upload-mb", type=int, default=50, help="Largest accepted PDF")
+
+    args = parser.parse_args(argv)
+    if getattr(args, "profile", None):
+        try:
+            get_profile(args.profile)
+        except KeyError as e:
+            parser.error(e.args[0])
+    if getattr(args, "ocr", False) and not ocr_available():
+        parser.error("--ocr needs the optional package pytesseract and the tesseract binary (pip install pytesseract)")
+    if getattr(args, "diagnostics", False):
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "batch":
+        start = time.perf_counter()
+        records = run_batch(
+            args.inbox, args.out, args.workers, args.profile, args.engine, args.format, args.profile_out, args.ocr
+        )
+        failed = sum(r['Status'] != 'OK' for r in records)
+        print(
+            f"{len(records)} file(s), {len(records) - failed} parsed, {failed} rejected/failed "
+            f"in {time.perf_counter() - start:.2f}s",
+            flush=True,
+        )
+        return 1 if failed else 0
+    if args.command == "inspect":
+        start = time.perf_counter()
+        infos = run_inspect(args.inputs, args.workers, args.profile, args.out)
+        rejected = sum(info.status == REJECTED for info in infos)
+        print(
+            f"{len(infos)} file(s), {len(infos) - rejected} ok, {rejected} rejected "
+            f"in {time.perf_counter() - start:.2f}s",
+            flush=True,
+        )
+        return 1 if rejected else 0
+    if args.command == "ingest":
+        records = run_ingest(args.inputs, args.db, args.workers, args.profile, args.engine, args.ocr)
+        failed = sum(r['Status'] not in ('OK', 'SKIPPED') for r in records)
+        print(
+            f"{len(records)} file(s), {sum(r['Status'] == 'OK' for r in records)} ingested, "
+            f"{sum(r['Status'] == 'SKIPPED' for r in records)} already stored, {failed} rejected/failed",
+            flush=True,
+        )
+        return 1 if failed else 0
+    if args.command == "report":
+        if not os.path.exists(args.db):
+            parser.error(f"no store at {args.db}")
+        with InvoiceStore(args.db) as store:
+            summary_df = store.pivot()
+            write_workbook({'Final Summary': summary_df, 'Advices': store.advices()}, args.out)
+        print(f"{len(summary_df)} invoice(s) written to {args.out}", flush=True)
+        return 0
+    if args.command == "serve":
+        if not (importlib.util.find_spec("starlette") and importlib.util.find_spec("uvicorn")):
+            parser.error("serve needs the optional packages starlette and uvicorn (pip install starlette uvicorn)")
+        import uvicorn
+
+        from .service import create_app
+
+        uvicorn.run(create_app(args.workers, args.queue, args.max_upload_mb), host=args.host, port=args.port)
+        return 0
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
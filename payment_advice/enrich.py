@@ -0,0 +1,251 @@
+"""
+Optional Import Name enrichment via the E-Invoice Ledger and State Details tables.
+
+The two tables are reduced once to an ImportNameIndex (normalised invoice
+number -> Import Name), cached by the SHA-256 of both files, so later
+advices and Streamlit reruns enrich with a single lookup.
+"""
+import hashlib
+import importlib.util
+import os
+import re
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from . import instrument
+from .aggregate import SUMMARY_COLUMNS
+from .cache import ResultCache
+
+LEDGER_REQUIRED = {'Invoice Number', 'Ship To (State)'}
+STATE_REQUIRED = {'STATE NAME', 'IMPORT NAME'}
+
+# Bump whenever the index layout or normalisation changes.
+INDEX_VERSION = "3"
+
+XLSX_MAGIC = b"PK\x03\x04"
+XLS_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+def sniff_format(head: bytes) -> str:
+    """
+    'xlsx' (zip container), 'xls' (OLE2 compound file) or 'csv', from the first bytes.
+    """
+    if head.startswith(XLSX_MAGIC):
+        return "xlsx"
+    if head.startswith(XLS_MAGIC):
+        return "xls"
+    return "csv"
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def _excel_engines(fmt: str):
+    # calamine reads both xlsx and xls and is much faster than openpyxl / xlrd.
+    engines = ["calamine"] if _has_module("python_calamine") else []
+    return engines + ["openpyxl" if fmt == "xlsx" else "xlrd"]
+
+
+def _csv_engines():
+    return (["pyarrow"] if _has_module("pyarrow") else []) + ["c"]
+
+
+def _select_columns(names, columns):
+    """
+    Maps wanted (trimmed) column names to the file's actual header names.
+    """
+    wanted = set(columns)
+    return [n for n in names if str(n).strip() in wanted]
+
+
+def read_table(file, columns=None):
+    """
+    Load CSV or Excel into a DataFrame with trimmed column names.
+    The format is sniffed from the leading bytes. With `columns`, only those
+    columns are read (matched after trimming) and they are read as text.
+    """
+    if file is None:
+        return None
+    file.seek(0)
+    fmt = sniff_format(file.read(8))
+
+    if fmt == "csv":
+        engines = _csv_engines()
+        file.seek(0)
+        names = list(pd.read_csv(file, nrows=0).columns)
+        reader = pd.read_csv
+    else:
+        engines = _excel_engines(fmt)
+        names = None
+        reader = pd.read_excel
+
+    for n, engine in enumerate(engines):
+        try:
+            kwargs = {"engine": engine}
+            if columns is not None:
+                if names is None:
+                    file.seek(0)
+                    names = list(reader(file, nrows=0, engine=engine).columns)
+                usecols = _select_columns(names, columns)
+                kwargs.update(usecols=usecols, dtype={c: str for c in usecols})
+            file.seek(0)
+            df = reader(file, **kwargs)
+            break
+        except Exception:
+            # Optional engine missing or unable to handle this file: try the next one.
+            if n == len(engines) - 1:
+                raise
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def normalize_invoice(s):
+    return str(s).upper().strip().replace(' ', '')
+
+
+def normalize_state(s):
+    return re.sub(r'\s+', ' ', str(s).upper().strip())
+
+
+def _per_unique(values, normalize):
+    # One normalize() call per distinct value, mapped back over the column, so the
+    # vector form gives exactly the scalar output (Unicode whitespace included).
+    if not isinstance(values.dtype, pd.StringDtype):
+        # Mixed objects (1 and 1.0 factorize together) are compared as their str().
+        values = values.map(str)
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    normalized = np.array([normalize(u) for u in np.asarray(uniques, dtype=object)], dtype=object)
+    return pd.Series(normalized[codes], index=values.index)
+
+
+def normalize_invoice_series(values):
+    """
+    normalize_invoice() over a column.
+    """
+    return _per_unique(values, normalize_invoice)
+
+
+def normalize_state_series(values):
+    """
+    normalize_state() over a column.
+    """
+    return _per_unique(values, normalize_state)
+
+
+class ImportNameIndex:
+    """
+    Normalised invoice number -> Import Name, prebuilt from the ledger and state
+    master. `pairs` keeps every (invoice, import name) combination the two
+    merges would produce, so invoices with several ledger states still fan out.
+    """
+
+    def __init__(self, pairs: pd.DataFrame):
+        self.pairs = pairs
+        self.unique = not pairs['__INV_JOIN__'].duplicated().any()
+        self._lookup = pairs.set_index('__INV_JOIN__')['Import Name'] if self.unique else None
+
+    @classmethod
+    def build(cls, ledger_df, state_df):
+        """
+        Raises ValueError naming the missing columns if either table is incomplete.
+        """
+        missing_ledger = LEDGER_REQUIRED - set(ledger_df.columns)
+        missing_state = STATE_REQUIRED - set(state_df.columns)
+        if missing_ledger:
+            raise ValueError(f"Ledger file is missing columns: {missing_ledger}")
+        if missing_state:
+            raise ValueError(f"State Details file is missing columns: {missing_state}")
+
+        ledger_pairs = pd.DataFrame({
+            '__INV_JOIN__': normalize_invoice_series(ledger_df['Invoice Number']),
+            '__STATE_JOIN__': normalize_state_series(ledger_df['Ship To (State)']),
+        }).drop_duplicates()
+        states = pd.DataFrame({
+            '__STATE_JOIN__': normalize_state_series(state_df['STATE NAME']),
+            'Import Name': state_df['IMPORT NAME'].to_numpy(),
+        }).drop_duplicates()
+
+        pairs = ledger_pairs.merge(states, on='__STATE_JOIN__', how='left')
+        return cls(pairs[['__INV_JOIN__', 'Import Name']].reset_index(drop=True))
+
+    def apply(self, pivot_df):
+        """
+        The invoice summary with 'Import Name' as its second column.
+        """
+        with instrument.span("enrich"):
+            return self._apply(pivot_df)
+
+    def _apply(self, pivot_df):
+        inv_join = normalize_invoice_series(pivot_df['Invoice Number'])
+        other_cols = [c for c in SUMMARY_COLUMNS if c != 'Invoice Number' and c in pivot_df.columns]
+        if self.unique:
+            out = pivot_df[['Invoice Number']].assign(
+                **{'Import Name': inv_join.map(self._lookup).to_numpy()}
+            )
+            return out.join(pivot_df[other_cols])
+
+        tmp = pivot_df.assign(__INV_JOIN__=inv_join.to_numpy()).merge(self.pairs, on='__INV_JOIN__', how='left')
+        return tmp[['Invoice Number', 'Import Name'] + other_cols]
+
+
+def add_import_name(pivot_df, ledger_df, state_df):
+    """
+    Adds an 'Import Name' column to the invoice summary.
+    Raises ValueError naming the missing columns if either table is incomplete.
+    """
+    return ImportNameIndex.build(ledger_df, state_df).apply(pivot_df)
+
+
+_index_cache = None
+
+
+def index_cache() -> ResultCache:
+    """
+    Process-wide ledger index cache; persisted under PAYMENT_ADVICE_CACHE_DIR/ledger when set.
+    """
+    global _index_cache
+    if _index_cache is None:
+        cache_dir = os.environ.get("PAYMENT_ADVICE_CACHE_DIR")
+        _index_cache = ResultCache(
+            max_entries=4,
+            directory=os.path.join(cache_dir, "ledger") if cache_dir else None,
+        )
+    return _index_cache
+
+
+def _file_bytes(file) -> bytes:
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    data = file.read()
+    file.seek(0)
+    return data
+
+
+def load_import_name_index(ledger_file, state_file, cache: ResultCache = None) -> ImportNameIndex:
+    """
+    The ImportNameIndex for these two uploads, read and built only on a cache miss.
+    """
+    cache = cache or index_cache()
+    ledger_bytes = _file_bytes(ledger_file)
+    state_bytes = _file_bytes(state_file)
+    h = hashlib.sha256(ledger_bytes)
+    h.update(b"\0" + state_bytes)
+    h.update(b"\0" + INDEX_VERSION.encode("ascii"))
+    key = h.hexdigest()
+
+    index = cache.get(key)
+    if index is None:
+        instrument.add("ledger_cache_miss")
+        with instrument.span("ledger_read"):
+            ledger_df = read_table(BytesIO(ledger_bytes), columns=LEDGER_REQUIRED)
+            state_df = read_table(BytesIO(state_bytes), columns=STATE_REQUIRED)
+        with instrument.span("ledger_index"):
+            index = ImportNameIndex.build(ledger_df, state_df)
+        cache.put(key, index)
+    else:
+        instrument.add("ledger_cache_hit")
+    return index
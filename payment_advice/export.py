@@ -0,0 +1,90 @@
+"""
+Export of the invoice summary and raw rows as XLSX, CSV or Parquet.
+
+Workbooks are streamed row by row with a constant-memory writer: xlsxwriter
+in constant_memory mode when installed, else openpyxl's write-only mode.
+CSV and Parquet exports are a zip holding one file per sheet.
+"""
+import importlib.util
+import math
+import zipfile
+from io import BytesIO
+
+from . import instrument
+
+SHEETS = ('Final Summary', 'Raw Data')
+
+# format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'csv': ('zip', 'application/zip'),
+    'parquet': ('zip', 'application/zip'),
+}
+
+
+def available_formats():
+    """
+    Export formats usable here; Parquet needs pyarrow.
+    """
+    return [f for f in EXPORT_FORMATS if f != 'parquet' or importlib.util.find_spec('pyarrow')]
+
+
+def _rows(df):
+    # Header, then each row with NaN written as an empty cell.
+    yield [str(c) for c in df.columns]
+    for row in df.itertuples(index=False, name=None):
+        yield [None if isinstance(v, float) and math.isnan(v) else v for v in row]
+
+
+def write_workbook(sheets: dict, output):
+    """
+    Streams {sheet name: DataFrame} into an .xlsx file or binary file object.
+    """
+    if importlib.util.find_spec('xlsxwriter'):
+        import xlsxwriter
+
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        for name, df in sheets.items():
+            worksheet = workbook.add_worksheet(name)
+            for r, row in enumerate(_rows(df)):
+                worksheet.write_row(r, 0, row)
+        workbook.close()
+        return
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for name, df in sheets.items():
+        worksheet = workbook.create_sheet(name)
+        for row in _rows(df):
+            worksheet.append(row)
+    workbook.save(output)
+
+
+def export_bytes(summary_df, raw_df, fmt: str = 'xlsx') -> bytes:
+    """
+    The 'Final Summary' and 'Raw Data' tables in the requested format.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(EXPORT_FORMATS)}")
+    with instrument.span(f"export_{fmt}"):
+        return _export_bytes(summary_df, raw_df, fmt)
+
+
+def _export_bytes(summary_df, raw_df, fmt):
+    sheets = dict(zip(SHEETS, (summary_df, raw_df)))
+    output = BytesIO()
+    if fmt == 'xlsx':
+        write_workbook(sheets, output)
+        return output.getvalue()
+
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, df in sheets.items():
+            stem = name.lower().replace(' ', '_')
+            if fmt == 'csv':
+                archive.writestr(f"{stem}.csv", df.to_csv(index=False))
+            else:
+                buf = BytesIO()
+                df.to_parquet(buf, index=False)
+                archive.writestr(f"{stem}.parquet", buf.getvalue())
+    return output.getvalue()
@@ -0,0 +1,121 @@
+"""
+Page text extraction for payment advices, serial or across a process pool.
+"""
+import os
+from io import BytesIO
+
+from . import instrument
+from .startup import EXTRACT_MODULES, process_pool
+
+# Chunks handed to each worker; more than one per worker evens out uneven pages.
+CHUNKS_PER_WORKER = 4
+
+_worker_pdf = None
+_worker_page_text = None
+_worker_prefilter = None
+
+
+def plain_page_text(page) -> str:
+    return page.extract_text() or ""
+
+
+def _read_and_release(page, page_text, prefilter=None):
+    # pdfplumber keeps per-page layout caches until the page is closed.
+    # Returns None for a page the prefilter rules out.
+    try:
+        if prefilter is not None:
+            with instrument.span("prefilter"):
+                if not prefilter(page):
+                    return None
+        with instrument.span("extract_text"):
+            return page_text(page)
+    finally:
+        page.close()
+
+
+def _count_skipped(texts):
+    for text in texts:
+        if text is None:
+            instrument.add("pages_skipped")
+            yield ""
+        else:
+            yield text
+
+
+def default_workers() -> int:
+    """
+    Worker count from PAYMENT_ADVICE_WORKERS, defaulting to 1 (serial).
+    """
+    try:
+        return max(1, int(os.environ.get("PAYMENT_ADVICE_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def page_ranges(start: int, stop: int, parts: int):
+    """
+    Splits [start, stop) into at most `parts` contiguous (start, stop) ranges.
+    """
+    total = stop - start
+    if total <= 0:
+        return []
+    parts = max(1, min(parts, total))
+    size, extra = divmod(total, parts)
+    ranges = []
+    lo = start
+    for n in range(parts):
+        hi = lo + size + (1 if n < extra else 0)
+        ranges.append((lo, hi))
+        lo = hi
+    return ranges
+
+
+def _init_worker(pdf_bytes: bytes, page_text, prefilter=None):
+    # Each worker opens the document once and keeps it for all its chunks.
+    global _worker_pdf, _worker_page_text, _worker_prefilter
+    import pdfplumber
+
+    _worker_pdf = pdfplumber.open(BytesIO(pdf_bytes))
+    _worker_page_text = page_text
+    _worker_prefilter = prefilter
+
+
+def _extract_range(start: int, stop: int):
+    return [
+        _read_and_release(_worker_pdf.pages[n], _worker_page_text, _worker_prefilter)
+        for n in range(start, stop)
+    ]
+
+
+def iter_page_texts(pdf, page1_text, pdf_bytes=None, workers: int = 1, page_text=plain_page_text,
+                    prefilter=None, read_ahead=()):
+    """
+    Yields the text of every page in order, reusing the cached page-1 text from the gate
+    and `read_ahead`, the texts of pages 2.. already read by the caller.
+    With workers > 1 and the raw bytes available, the remaining pages are extracted in a process pool.
+    `page_text(page) -> str` and `prefilter(page) -> bool` must be picklable (module-level
+    functions or partials of them). Pages the prefilter rejects are yielded as "" without
+    extraction and counted as pages_skipped.
+    """
+    yield page1_text
+    yield from read_ahead
+    start = 1 + len(read_ahead)
+    page_count = len(pdf.pages)
+    if workers <= 1 or pdf_bytes is None or page_count <= start + 1:
+        yield from _count_skipped(_read_and_release(page, page_text, prefilter) for page in pdf.pages[start:])
+        return
+
+    ranges = page_ranges(start, page_count, workers * CHUNKS_PER_WORKER)
+    with process_pool(
+        min(workers, len(ranges)), EXTRACT_MODULES,
+        initializer=_init_worker, initargs=(pdf_bytes, page_text, prefilter),
+    ) as pool:
+        # map() keeps submission order, so the merged stream matches the serial path.
+        chunks = pool.map(_extract_range, *zip(*ranges))
+        while True:
+            # Wall time spent waiting on the pool counts as extraction.
+            with instrument.span("extract_text"):
+                texts = next(chunks, None)
+            if texts is None:
+                break
+            yield from _count_skipped(texts)
@@ -0,0 +1,139 @@
+"""
+Per-run timing spans and counters.
+
+Library code calls span() and add() unconditionally; both are no-ops unless a
+collect() block is active in the current context. On exit a run is logged as
+one JSON record on the "payment_advice" logger and, when asked, profiled with
+cProfile (or pyinstrument) into a dump file. Hosts that configure no logging of
+their own (the Streamlit apps) call log_to_stderr() to see those records.
+"""
+import contextvars
+import importlib.util
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("payment_advice")
+
+_current = contextvars.ContextVar("payment_advice_run_stats", default=None)
+
+
+class RunStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.spans = {}
+        self.counters = {}
+        self.total = 0.0
+        self.profile_path = None
+
+    def add_span(self, name: str, seconds: float):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def add(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> dict:
+        return {
+            "run": self.name,
+            "total_s": round(self.total, 6),
+            "spans_s": {k: round(v, 6) for k, v in self.spans.items()},
+            "counters": dict(self.counters),
+            "profile": self.profile_path,
+        }
+
+
+def log_to_stderr(level: str = None):
+    """
+    Sends the "payment_advice" logger to stderr, one message per line, at
+    `level` (default PAYMENT_ADVICE_LOG_LEVEL, else INFO). Safe to call on
+    every Streamlit rerun: the handler is only added once.
+    """
+    logger.setLevel((level or os.environ.get("PAYMENT_ADVICE_LOG_LEVEL", "INFO")).upper())
+    if not any(getattr(h, "payment_advice", False) for h in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.payment_advice = True
+        logger.addHandler(handler)
+        # Records are written here; a root handler would print them twice.
+        logger.propagate = False
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def span(name: str):
+    """
+    Times the block into the active run's `name` span (accumulating).
+    """
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_span(name, time.perf_counter() - start)
+
+
+def add(name: str, n: int = 1):
+    stats = _current.get()
+    if stats is not None:
+        stats.add(name, n)
+
+
+def _start_profiler(profile_dir):
+    if not profile_dir:
+        return None
+    os.makedirs(profile_dir, exist_ok=True)
+    if os.environ.get("PAYMENT_ADVICE_PROFILER") == "pyinstrument" and importlib.util.find_spec("pyinstrument"):
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+    else:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    profiler.enable() if hasattr(profiler, "enable") else profiler.start()
+    return profiler
+
+
+def _stop_profiler(profiler, profile_dir, name) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    if hasattr(profiler, "disable"):
+        profiler.disable()
+        path = os.path.join(profile_dir, f"{safe}-{stamp}.prof")
+        profiler.dump_stats(path)
+    else:
+        profiler.stop()
+        path = os.path.join(profile_dir, f"{safe}-{stamp}.html")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(profiler.output_html())
+    return path
+
+
+@contextmanager
+def collect(name: str = "run", profile_dir: str = None):
+    """
+    Collects spans and counters for the block and yields the RunStats.
+    profile_dir (default PAYMENT_ADVICE_PROFILE_DIR) enables a profiler dump;
+    PAYMENT_ADVICE_PROFILER=pyinstrument picks pyinstrument over cProfile.
+    """
+    stats = RunStats(name)
+    token = _current.set(stats)
+    profile_dir = profile_dir or os.environ.get("PAYMENT_ADVICE_PROFILE_DIR")
+    profiler = _start_profiler(profile_dir)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.total = time.perf_counter() - start
+        if profiler is not None:
+            stats.profile_path = _stop_profiler(profiler, profile_dir, name)
+        _current.reset(token)
+        logger.info(json.dumps(stats.to_dict()))
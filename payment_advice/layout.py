@@ -0,0 +1,94 @@
+"""
+Layout-aware page reader built on word coordinates.
+
+Instead of pdfplumber's full text layout pass, words are grouped into lines by
+their vertical position. Column x-ranges are calibrated once per document from
+the first clean invoice row, on page 1 or the first later page that has one
+(parser.calibrate_advice). Invoice rows are then rebuilt cell by cell, so
+an amount split into several words still comes back as one token. Every page
+renders to the same "one line per row, space-separated tokens" text that the
+line parser expects.
+"""
+import re
+from typing import NamedTuple
+
+AMOUNT_RE = re.compile(r'-?\d+(?:,\d{3})*(?:\.\d{1,2})?-?')
+
+# Words whose tops differ by at most this many points share a line.
+Y_TOLERANCE = 3
+
+
+class ColumnLayout(NamedTuple):
+    # x boundaries between the doc no / invoice no / invoice amt / payment amt columns
+    edges: tuple
+    invoice_re: re.Pattern
+
+
+def word_lines(page):
+    """
+    Page words grouped into lines, top to bottom, each sorted left to right.
+    """
+    words = sorted(page.extract_words(), key=lambda w: (w["top"], w["x0"]))
+    lines = []
+    current = []
+    top = None
+    for word in words:
+        if current and word["top"] - top > Y_TOLERANCE:
+            lines.append(sorted(current, key=lambda w: w["x0"]))
+            current = []
+        if not current:
+            top = word["top"]
+        current.append(word)
+    if current:
+        lines.append(sorted(current, key=lambda w: w["x0"]))
+    # Keep only what rendering needs; this also makes page 1 cheap to hold on to.
+    return [[(w["x0"], w["x1"], w["text"]) for w in line] for line in lines]
+
+
+def calibrate(lines, profile):
+    """
+    Column boundaries from the first clean invoice row (invoice number second,
+    followed by two whole amounts), or None if there is no such row.
+    """
+    for line in lines:
+        if (
+            len(line) >= 4 and profile.is_invoice_no(line[1][2])
+            and AMOUNT_RE.fullmatch(line[2][2]) and AMOUNT_RE.fullmatch(line[3][2])
+        ):
+            edges = tuple((line[k - 1][1] + line[k][0]) / 2 for k in range(1, 4))
+            return ColumnLayout(edges, profile.invoice_re)
+    return None
+
+
+def _render_row(line, layout):
+    cells = [[], [], [], []]
+    for x0, x1, text in line:
+        centre = (x0 + x1) / 2
+        col = 0
+        while col < 3 and centre >= layout.edges[col]:
+            col += 1
+        cells[col].append(text)
+    if not cells[0] or not cells[1] or layout.invoice_re.match("".join(cells[1])) is None:
+        return None
+    tokens = ["".join(cell) for cell in cells if cell]
+    # Only trust the cell split if every amount cell is a single number.
+    for cell in cells[2:]:
+        if len(cell) > 1 and AMOUNT_RE.fullmatch("".join(cell)) is None:
+            return None
+    return " ".join(tokens)
+
+
+def lines_text(lines, layout=None) -> str:
+    """
+    Renders word lines to page text. With a layout, rows are rebuilt from columns
+    where the cell split is unambiguous; other lines are joined as-is.
+    """
+    out = []
+    for line in lines:
+        row = _render_row(line, layout) if layout is not None and len(line) >= 3 else None
+        out.append(row if row is not None else " ".join(text for _, _, text in line))
+    return "\n".join(out)
+
+
+def layout_page_text(page, layout=None) -> str:
+    return lines_text(word_lines(page), layout)
@@ -0,0 +1,208 @@
+"""
+OCR fallback for scanned pages (Tesseract via pytesseract, optional dependency).
+
+Only text-less pages are OCR'd: pages whose content stream shows no text but
+draws an image. They are rendered with pypdfium2 (installed with pdfplumber).
+A scanned page 1 is read first, in-process, for the account gate; the other
+pages are only looked at once the gate has passed, and are read in a process
+pool while the digital pages are extracted as usual.
+The OCR text then goes through the same line parser.
+Results are cached per page by a hash of the page's embedded image data, so
+re-uploads and repeated cover scans are read once.
+"""
+import hashlib
+import importlib.util
+import os
+import shutil
+
+from . import instrument
+from .startup import process_pool
+
+# Bump whenever OCR settings change the text produced; it is part of the OCR cache key.
+OCR_VERSION = "1"
+OCR_DPI = 300
+OCR_LANG = "eng"
+# --psm 6: one uniform block of text, which keeps each table row on one line.
+OCR_CONFIG = "--psm 6"
+
+OCR_MODULES = ("PIL.Image", "pypdfium2", "pytesseract", "payment_advice.ocr")
+
+_worker_pdf = None
+_ocr_cache = None
+
+
+def ocr_available() -> bool:
+    """
+    True when pytesseract and the tesseract binary are both installed.
+    """
+    return importlib.util.find_spec("pytesseract") is not None and shutil.which("tesseract") is not None
+
+
+def ocr_cache():
+    """
+    Process-wide OCR page cache, on disk under PAYMENT_ADVICE_CACHE_DIR/ocr when that is set.
+    """
+    global _ocr_cache
+    if _ocr_cache is None:
+        from .cache import ResultCache
+
+        directory = os.environ.get("PAYMENT_ADVICE_CACHE_DIR")
+        _ocr_cache = ResultCache(max_entries=1024, directory=os.path.join(directory, "ocr") if directory else None)
+    return _ocr_cache
+
+
+def textless_pages(pdf, indexes=None) -> list:
+    """
+    Indexes of the pages (all, or those in `indexes`) that draw an image but show no text.
+    """
+    from .prefilter import has_image, shown_strings
+
+    found = []
+    for n in range(len(pdf.pages)) if indexes is None else indexes:
+        page = pdf.pages[n]
+        # Only pages with an image are decoded; a form XObject counts as text.
+        try:
+            if not has_image(page.page_obj):
+                continue
+            fragments = shown_strings(page.page_obj, pdf.rsrcmgr)
+        except Exception:
+            # Undecodable (a missing font, say): leave the page to text extraction.
+            continue
+        if fragments is not None and not "".join(fragments).strip():
+            found.append(n)
+    return found
+
+
+def image_key(page) -> str:
+    """
+    Cache key for a page's OCR text: its image streams plus the OCR settings.
+    """
+    from pdfminer.pdftypes import resolve1
+
+    h = hashlib.sha256()
+    xobjects = resolve1((resolve1(page.page_obj.resources) or {}).get("XObject")) or {}
+    for name in sorted(xobjects):
+        h.update(resolve1(xobjects[name]).get_rawdata() or b"")
+    h.update(f"\0{page.width}x{page.height}\0{OCR_DPI}\0{OCR_LANG}\0{OCR_CONFIG}\0{OCR_VERSION}".encode())
+    return h.hexdigest()
+
+
+def _init_ocr_worker(pdf_bytes: bytes):
+    # Each worker opens the document once for all its pages.
+    global _worker_pdf
+    import pypdfium2
+
+    _worker_pdf = pypdfium2.PdfDocument(pdf_bytes)
+
+
+def _ocr_page(index: int) -> str:
+    return _ocr_image(_worker_pdf[index])
+
+
+def _ocr_image(page) -> str:
+    # page is a pypdfium2 page; it is closed once rendered.
+    import pytesseract
+
+    try:
+        image = page.render(scale=OCR_DPI / 72, grayscale=True).to_pil()
+    finally:
+        page.close()
+    return pytesseract.image_to_string(image, lang=OCR_LANG, config=OCR_CONFIG)
+
+
+class OcrPages:
+    """
+    OCR text for a document's text-less pages. first_page() reads page 1
+    for the gate; start() sends the pages asked for to a process pool, and
+    cached pages are answered at once.
+    """
+
+    def __init__(self, pdf_bytes: bytes, workers: int = 1):
+        self.pages = {}
+        self._pdf_bytes = pdf_bytes
+        self._workers = workers
+        self._pool = None
+        self._keys = {}
+
+    def first_page(self, pdf):
+        """
+        Page 1's OCR text if it is text-less, read in this process; None otherwise.
+        """
+        if not self._detect(pdf, [0]):
+            return None
+        if 0 not in self.pages:
+            import pypdfium2
+
+            doc = pypdfium2.PdfDocument(self._pdf_bytes)
+            try:
+                with instrument.span("ocr"):
+                    text = _ocr_image(doc[0])
+            finally:
+                doc.close()
+            instrument.add("pages_ocr")
+            ocr_cache().put(self._keys[0], text)
+            self.pages[0] = text
+        return self.pages[0]
+
+    def start(self, pdf, indexes):
+        """
+        Starts OCR of the text-less pages among `indexes` that are not cached.
+        """
+        pending = [n for n in self._detect(pdf, indexes) if n not in self.pages]
+        if not pending:
+            return
+        self._pool = process_pool(
+            min(max(1, self._workers), len(pending)), OCR_MODULES,
+            initializer=_init_ocr_worker, initargs=(self._pdf_bytes,),
+        )
+        for n in pending:
+            self.pages[n] = self._pool.submit(_ocr_page, n)
+
+    def _detect(self, pdf, indexes) -> list:
+        # Text-less pages among indexes; cached OCR text is filled in straight away.
+        with instrument.span("ocr_detect"):
+            found = textless_pages(pdf, indexes)
+        if found and not ocr_available():
+            raise RuntimeError("Scanned pages need OCR: install pytesseract and the tesseract binary")
+        cache = ocr_cache()
+        for n in found:
+            key = self._keys[n] = image_key(pdf.pages[n])
+            text = cache.get(key)
+            if text is not None:
+                instrument.add("ocr_cache_hit")
+                self.pages[n] = text
+        return found
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.pages
+
+    def text(self, index: int) -> str:
+        """
+        The OCR text of page `index` (0-based), waiting for the pool if needed.
+        """
+        text = self.pages[index]
+        if not isinstance(text, str):
+            with instrument.span("ocr"):
+                text = text.result()
+            instrument.add("pages_ocr")
+            ocr_cache().put(self._keys[index], text)
+            self.pages[index] = text
+        return text
+
+    def merge(self, page_texts):
+        """
+        Yields page_texts with each text-less page replaced by its OCR text.
+        """
+        for n, text in enumerate(page_texts):
+            yield self.text(n) if n in self.pages else text
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,341 @@
+"""
+RIL payment advice parser: account gate, line state machine and invoice pivot.
+"""
+import re
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import partial
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+from . import instrument
+from .extract import _read_and_release, iter_page_texts, plain_page_text
+from .layout import calibrate, layout_page_text, lines_text, word_lines
+from .profiles import Profile, profile_for_account
+from .rows import AdviceRow, RowBuffer, TdsCapture
+
+# pdfplumber, pdfminer and pandas are imported by the stages that use them
+# (pdf_open, prefilter, build_frame/aggregate), so importing this module is cheap.
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bump whenever parsing output changes; it is part of the result cache key.
+PARSER_VERSION = "4.5.1"
+
+# "text": pdfplumber extract_text(); "layout": word coordinates bucketed into columns.
+ENGINES = ("text", "layout")
+
+ACCT_REGEX = re.compile(r"Your\s*A/c\s*with\s*us\s*:\s*(\d+)", re.IGNORECASE)
+
+
+class InvalidAdviceError(ValueError):
+    """
+    Raised when a file is not a payment advice for the expected account.
+    """
+
+
+@dataclass
+class ParseResult:
+    profile: Profile
+    raw: "pd.DataFrame"
+    tds_map_signed: dict
+    pivot: "pd.DataFrame"
+
+
+# Precompiled once; the line loop below is the hot path.
+NUMBER_RE = re.compile(r'(-?)(\d+(?:,\d{3})*(?:\.\d{1,2})?)(-?)')
+DATE_RE = re.compile(r'\d{2}\.\d{2}\.\d{4}')
+DEBIT_RE = re.compile(r'Rs\.?([\d,]+\.\d{1,2})')
+DIGIT_RE = re.compile(r'\d')
+# Both leading tokens of a line start with a date (the line after an invoice row).
+DATE_PAIR_RE = re.compile(r'\s*\d{2}\.\d{2}\.\d{4}\S*\s+(\d{2}\.\d{2}\.\d{4}\S*)')
+
+
+def parse_signed_number(x):
+    """
+    First number in the text as a float; a leading or trailing '-' makes it negative.
+    """
+    if not isinstance(x, str):
+        x = str(x)
+    match = NUMBER_RE.search(x)
+    if match is None:
+        return 0.0
+    lead, digits, trail = match.groups()
+    value = float(digits.replace(',', '')) if ',' in digits else float(digits)
+    return -value if lead or trail else value
+
+
+def is_date(s):
+    return DATE_RE.match(s) is not None
+
+
+def extract_debit(line):
+    match = DEBIT_RE.search(line)
+    return float(match.group(1).replace(',', '')) if match else 0.0
+
+
+def invoice_date(line):
+    """
+    Returns the second date token of a date line, or None if the line is not one.
+    """
+    match = DATE_PAIR_RE.match(line)
+    return match.group(1) if match else None
+
+
+def read_account(text):
+    """
+    Returns the number after 'Your A/c with us :' in page text, or None.
+    """
+    m = ACCT_REGEX.search(text)
+    return m.group(1).strip() if m else None
+
+
+def invalid_advice(reason: str) -> InvalidAdviceError:
+    return InvalidAdviceError(f"Invalid Payment Advice file: {reason}.")
+
+
+def open_page1(pdf_file, read_page=plain_page_text):
+    """
+    Opens the PDF ONCE and reads ONLY page 1 with `read_page`.
+    Returns (pdf, page1); the caller owns the handle and must close it.
+    Raises InvalidAdviceError saying why if the file is unreadable or empty.
+    """
+    import pdfplumber
+
+    pdf = None
+    try:
+        pdf_file.seek(0)
+        with instrument.span("pdf_open"):
+            pdf = pdfplumber.open(pdf_file)
+        if len(pdf.pages) == 0:
+            raise invalid_advice("the PDF has no pages")
+        page = pdf.pages[0]
+        try:
+            with instrument.span("extract_text"):
+                return pdf, read_page(page)
+        finally:
+            page.close()
+    except Exception as e:
+        if pdf is not None:
+            pdf.close()
+        if isinstance(e, InvalidAdviceError):
+            raise
+        raise invalid_advice(f"unreadable PDF ({type(e).__name__}: {e})") from e
+
+
+def gate_account(account, profile: Profile = None, page1_text: str = None) -> Profile:
+    """
+    The account gate: returns the profile for `account` (the given one, or
+    the registry's), or raises InvalidAdviceError saying why it does not pass.
+    """
+    if account is None:
+        if page1_text is not None and not page1_text.strip():
+            raise invalid_advice("page 1 has no text layer (scanned image?)")
+        raise invalid_advice("no 'Your A/c with us' account number on page 1")
+    if profile is None:
+        profile = profile_for_account(account)
+        if profile is None:
+            raise invalid_advice(f"account {account} matches no vendor profile")
+    elif account != profile.account:
+        raise invalid_advice(f"account {account} is not the '{profile.key}' account {profile.account}")
+    return profile
+
+
+def iter_records(page_texts, profile: Profile):
+    """
+    Runs the invoice state machine over page texts in document order, yielding
+    AdviceRow and TdsCapture records as soon as each page is read.
+    """
+    invoice_match = profile.invoice_re.match
+    stats = instrument.current()
+    tds_seen = set()
+    seen_entries = set()
+    last_invoice = None
+
+    for text in page_texts:
+        started = time.perf_counter()
+        rows = duplicates = tds_captured = 0
+        lines = text.split("\n")
+        n_lines = len(lines)
+        i = 0
+        while i < n_lines:
+            line = lines[i]
+            tokens = line.split()
+            n_tokens = len(tokens)
+
+            # Invoice rows: 4+ tokens is a main entry, exactly 3 is a GST entry (paid/hold)
+            if n_tokens >= 3 and invoice_match(tokens[1]) is not None:
+                inv_no = tokens[1]
+                inv_date = ""
+                if i + 1 < n_lines:
+                    next_date = invoice_date(lines[i + 1])
+                    if next_date is not None:
+                        inv_date = next_date
+                        i += 1
+
+                if n_tokens >= 4:
+                    inv_amt = parse_signed_number(tokens[2])
+                    pay_amt = key_amt = parse_signed_number(tokens[3])
+                    status = "MAIN ENTRY"
+                    debit_val = 0.0
+                    if i + 1 < n_lines and "Short payment" in lines[i + 1]:
+                        debit_val = extract_debit(lines[i + 1])
+                        i += 1
+                    gst_amt = 0.0
+                else:
+                    gst_amt = key_amt = parse_signed_number(tokens[2])
+                    status = "GST PAID" if gst_amt > 0 else "GST HOLD"
+                    inv_amt = pay_amt = debit_val = 0.0
+
+                key = (inv_no, key_amt, status)
+                if key not in seen_entries:
+                    seen_entries.add(key)
+                    rows += 1
+                    yield AdviceRow(inv_no, inv_date, inv_amt, gst_amt, pay_amt, debit_val, status)
+                else:
+                    duplicates += 1
+                last_invoice = inv_no
+                line = lines[i]
+
+            # TDS line (capture signed value, once per invoice)
+            if last_invoice and "TDS Amount" in line and last_invoice not in tds_seen:
+                for tok in line.split():
+                    if DIGIT_RE.search(tok):
+                        tds_seen.add(last_invoice)
+                        tds_captured += 1
+                        yield TdsCapture(last_invoice, parse_signed_number(tok))
+                        break
+
+            i += 1
+
+        if stats is not None:
+            stats.add_span("parse_lines", time.perf_counter() - started)
+            stats.add("pages")
+            stats.add("lines", n_lines)
+            stats.add("rows", rows)
+            stats.add("duplicates_skipped", duplicates)
+            stats.add("tds_captured", tds_captured)
+
+
+def parse_pages(page_texts, profile: Profile):
+    """
+    Collects iter_records() into a RowBuffer. Returns (rows, tds_map_signed).
+    """
+    rows = RowBuffer()
+    tds_map_signed = {}
+    for record in iter_records(page_texts, profile):
+        if type(record) is TdsCapture:
+            tds_map_signed[record.invoice_number] = record.tds_signed
+        else:
+            rows.append(record)
+    return rows, tds_map_signed
+
+
+def _as_file(source):
+    """
+    Accepts a path, raw bytes or a binary file object. Returns (file_obj, raw_bytes).
+    """
+    if isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+    elif hasattr(source, "read"):
+        source.seek(0)
+        data = source.read()
+        source.seek(0)
+    else:
+        with open(source, "rb") as fh:
+            data = fh.read()
+    return BytesIO(data), data
+
+
+def calibrate_advice(pdf, page1_lines, profile: Profile):
+    """
+    Column layout from the first clean invoice row: on page 1, or else on the
+    first later page with one (after a cover page or a scanned page 1).
+    Returns (layout or None, word lines of the pages 2.. read to find it).
+    """
+    layout = calibrate(page1_lines, profile)
+    ahead = []
+    for page in pdf.pages[1:] if layout is None else ():
+        lines = _read_and_release(page, word_lines)
+        ahead.append(lines)
+        layout = calibrate(lines, profile)
+        if layout is not None:
+            break
+    if layout is None:
+        instrument.add("layout_uncalibrated")
+        instrument.logger.warning(
+            "No clean invoice row to calibrate columns on; the layout engine reads this advice as plain lines"
+        )
+    return layout, ahead
+
+
+@contextmanager
+def open_advice(source, profile: Profile = None, workers: int = 1, engine: str = "text", prefilter: bool = True,
+                ocr: bool = False):
+    """
+    Opens one advice, applies the page-1 account gate and yields
+    (profile, page_texts), where page_texts streams every page's text in order.
+    With no profile, the vendor is picked from the registry by the account number.
+    With prefilter, pages 2..N holding no invoice or TDS candidates come through
+    as "" without text extraction. With ocr, pages that are only a scanned image
+    (page 1 included) are read by OCR instead; see ocr.py.
+    Raises InvalidAdviceError if page 1 does not carry a matching account number.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+    layout_engine = engine == "layout"
+    pdf_file, pdf_bytes = _as_file(source)
+
+    # ✅ Gatekeeper check BEFORE any parsing (Page 1 only, single open)
+    pdf, page1 = open_page1(pdf_file, word_lines if layout_engine else plain_page_text)
+    from .ocr import OcrPages
+
+    with pdf, (OcrPages(pdf_bytes, workers) if ocr else nullcontext()) as ocr_pages:
+        ocr_text = ocr_pages.first_page(pdf) if ocr_pages is not None else None
+        page1_scanned = ocr_text is not None
+        if page1_scanned:
+            page1_text = ocr_text
+        else:
+            page1_text = lines_text(page1) if layout_engine else page1
+        profile = gate_account(read_account(page1_text), profile, page1_text)
+        if ocr_pages is not None:
+            # Pages 2..N are only looked at, and OCR'd, once the gate has passed.
+            ocr_pages.start(pdf, range(1, len(pdf.pages)))
+
+        page_text = plain_page_text
+        read_ahead = ()
+        if layout_engine:
+            layout, ahead = calibrate_advice(pdf, page1, profile)
+            if not page1_scanned:
+                page1_text = lines_text(page1, layout)
+            read_ahead = [lines_text(lines, layout) for lines in ahead]
+            page_text = partial(layout_page_text, layout=layout)
+        del page1
+
+        from .prefilter import page_has_candidates
+
+        page_filter = partial(page_has_candidates, invoice_pattern=profile.invoice_pattern) if prefilter else None
+        texts = iter_page_texts(pdf, page1_text, pdf_bytes, workers, page_text, page_filter, read_ahead)
+        page_texts = ocr_pages.merge(texts) if ocr_pages is not None else texts
+        try:
+            yield profile, page_texts
+        finally:
+            page_texts.close()
+            texts.close()
+
+
+def parse_advice(source, profile: Profile = None, workers: int = 1, engine: str = "text",
+                 prefilter: bool = True, ocr: bool = False) -> ParseResult:
+    """
+    Parses one payment advice into raw rows, the signed TDS map and the invoice pivot.
+    See open_advice() for vendor routing, the account gate, page prefiltering and OCR.
+    """
+    from .aggregate import build_pivot
+
+    with open_advice(source, profile, workers, engine, prefilter, ocr) as (profile, page_texts):
+        rows, tds_map_signed = parse_pages(page_texts, profile)
+
+    with instrument.span("build_frame"):
+        df_all = rows.to_frame(tds_map_signed)
+    return ParseResult(profile=profile, raw=df_all, tds_map_signed=tds_map_signed, pivot=build_pivot(df_all))
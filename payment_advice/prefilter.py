@@ -0,0 +1,182 @@
+"""
+Cheap per-page check for whether a page can hold anything the parser reads.
+
+Only the page's content stream is tokenised: the shown strings are decoded
+with the page fonts, and none of pdfplumber's per-character layout work is
+done. A page can be skipped only if its text holds no invoice number, in
+drawing or in reading order, and no 'TDS' at all; such a page yields no
+records and leaves the state machine untouched. Over-matching only costs an
+extraction, so the checks are loose and whatever cannot be decoded counts as
+a candidate.
+"""
+import re
+from functools import lru_cache
+
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFContentParser
+from pdfminer.pdftypes import PDFObjRef, resolve1
+from pdfminer.psparser import PSEOF, KWD, PSKeyword, literal_name
+
+# Any 'TDS', wherever and in whatever order 'TDS Amount' is drawn.
+TDS_MARK = "TDS"
+
+_TF, _TJ, _TJ_ARRAY, _QUOTE, _DQUOTE, _DO = (KWD(k) for k in (b"Tf", b"Tj", b"TJ", b"'", b'"', b"Do"))
+_BT, _TM, _TD, _TD_LEADING, _TSTAR, _TL = (KWD(k) for k in (b"BT", b"Tm", b"Td", b"TD", b"T*", b"TL"))
+_WS_RE = re.compile(r"\s+")
+# Literal strings in a content stream, for the raw fast path.
+_LITERAL_RE = re.compile(rb"\(((?:\\.|[^\\)])*)\)", re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def start_pattern(invoice_pattern: str):
+    """
+    The invoice pattern without its leading '^', for searching anywhere in the
+    decoded text; None if other anchors make that unsafe.
+    """
+    body = invoice_pattern[1:] if invoice_pattern.startswith("^") else invoice_pattern
+    if any(anchor in body for anchor in ("^", "$", "\\A", "\\Z", "\\b", "\\B")):
+        return None
+    return re.compile(body, re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _raw_pattern(invoice_pattern: str):
+    return re.compile(start_pattern(invoice_pattern).pattern.encode("latin-1"), re.IGNORECASE)
+
+
+def page_has_candidates(page, invoice_pattern: str) -> bool:
+    """
+    False only when the page's text was fully decoded and holds no invoice row
+    or TDS line candidates.
+    """
+    start_re = start_pattern(invoice_pattern)
+    if start_re is None:
+        return True
+    try:
+        # Fast path: most advice pages show a candidate in plain literal strings.
+        if _raw_hit(page, _raw_pattern(invoice_pattern)):
+            return True
+        placed = placed_strings(page.page_obj, page.pdf.rsrcmgr)
+    except Exception:
+        return True
+    if placed is None:
+        return True
+
+    # Searched anywhere, like _raw_hit, in drawing order and in reading order
+    # (top to bottom, left to right): a row drawn as one kerned TJ array, or
+    # word by word out of order, still shows its invoice number in one of them.
+    drawn = "".join(text for _, _, text in placed)
+    read = "".join(text for _, _, text in sorted(placed, key=lambda p: (-round(p[0]), p[1])))
+    return (TDS_MARK in drawn or start_re.search(drawn) is not None
+            or start_re.search(read) is not None)
+
+
+def literal_strings(stream) -> list:
+    """
+    The literal (...) strings in one content stream, undecoded and unescaped.
+    """
+    return _LITERAL_RE.findall(resolve1(stream).get_data())
+
+
+def _raw_hit(page, raw_re) -> bool:
+    # Over-matching here only sends a page to extraction, so no decoding is needed.
+    shown = b" ".join(b"".join(literal_strings(stream)) for stream in page.page_obj.contents)
+    return TDS_MARK.encode("ascii") in shown or raw_re.search(shown) is not None
+
+
+def shown_strings(page_obj, rsrcmgr):
+    """
+    Decoded strings of every text-showing operator on a pdfminer PDFPage, or
+    None if some text is out of reach (a form XObject).
+    """
+    placed = placed_strings(page_obj, rsrcmgr)
+    return None if placed is None else [text for _, _, text in placed]
+
+
+def placed_strings(page_obj, rsrcmgr):
+    """
+    shown_strings() as (y, x, text), with the text line origin each string was
+    shown at. Only the text matrix is followed (no cm), which is enough to put
+    a table's strings in reading order.
+    """
+    resources = resolve1(page_obj.resources) or {}
+    fonts = resolve1(resources.get("Font")) or {}
+    xobjects = resolve1(resources.get("XObject")) or {}
+    font = None
+    leading = 0.0
+    line = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    placed = []
+    operands = []
+    parser = PDFContentParser(page_obj.contents)
+    while True:
+        try:
+            _, obj = parser.nextobject()
+        except PSEOF:
+            break
+        if not isinstance(obj, PSKeyword):
+            operands.append(obj)
+            continue
+        if obj is _TF:
+            font = _font(rsrcmgr, fonts, operands[-2])
+        elif obj is _BT:
+            line = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+        elif obj is _TM:
+            line = tuple(float(v) for v in operands[-6:])
+        elif obj is _TD or obj is _TD_LEADING:
+            tx, ty = (float(v) for v in operands[-2:])
+            line = _next_line(line, tx, ty)
+            if obj is _TD_LEADING:
+                leading = -ty
+        elif obj is _TL:
+            leading = float(operands[-1])
+        elif obj is _TSTAR:
+            line = _next_line(line, 0.0, -leading)
+
+        if obj is _QUOTE or obj is _DQUOTE:
+            line = _next_line(line, 0.0, -leading)
+        if obj is _TJ or obj is _QUOTE or obj is _DQUOTE:
+            placed.append((line[5], line[4], _decode(font, operands[-1])))
+        elif obj is _TJ_ARRAY:
+            text = "".join(_decode(font, s) for s in operands[-1] if isinstance(s, bytes))
+            placed.append((line[5], line[4], text))
+        elif obj is _DO:
+            # Images are fine; a form XObject can carry text of its own.
+            xobject = resolve1(xobjects.get(literal_name(operands[-1])))
+            if xobject is None or literal_name(xobject.get("Subtype")) != "Image":
+                return None
+        operands = []
+    return placed
+
+
+def _next_line(line, tx, ty):
+    # Td: translate the line matrix by (tx, ty) in text space.
+    a, b, c, d, e, f = line
+    return a, b, c, d, e + tx * a + ty * c, f + tx * b + ty * d
+
+
+def has_image(page_obj) -> bool:
+    """
+    True if the page's resources include an image XObject.
+    """
+    xobjects = resolve1((resolve1(page_obj.resources) or {}).get("XObject")) or {}
+    return any(literal_name((resolve1(x) or {}).get("Subtype")) == "Image" for x in xobjects.values())
+
+
+def _font(rsrcmgr, fonts, name):
+    spec = fonts.get(literal_name(name))
+    if spec is None:
+        raise KeyError(name)
+    objid = spec.objid if isinstance(spec, PDFObjRef) else None
+    return rsrcmgr.get_font(objid, resolve1(spec))
+
+
+def _decode(font, data: bytes) -> str:
+    if font is None:
+        raise ValueError("text shown before a font was set")
+    chars = []
+    for cid in font.decode(data):
+        try:
+            chars.append(font.to_unichr(cid))
+        except PDFUnicodeNotDefined:
+            chars.append(f"(cid:{cid})")
+    return "".join(chars)
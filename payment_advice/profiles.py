@@ -0,0 +1,83 @@
+"""
+Vendor profiles: the account number on page 1 and the invoice-number pattern.
+
+Profiles live in a JSON registry (the bundled profiles.json, or the file named
+by PAYMENT_ADVICE_PROFILES) and are compiled once when first loaded.
+"""
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+BUNDLED_PROFILES = os.path.join(os.path.dirname(__file__), "profiles.json")
+
+
+@dataclass(frozen=True)
+class Profile:
+    key: str
+    title: str
+    account: str
+    invoice_pattern: str
+    invoice_re: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "invoice_re", re.compile(self.invoice_pattern, re.IGNORECASE))
+
+    def is_invoice_no(self, s) -> bool:
+        return self.invoice_re.match(s) is not None
+
+
+def registry_path() -> str:
+    return os.environ.get("PAYMENT_ADVICE_PROFILES") or BUNDLED_PROFILES
+
+
+@lru_cache(maxsize=None)
+def load_profiles(path: str = None) -> dict:
+    """
+    Loads {key: Profile} from a JSON registry. Account numbers must be unique.
+    """
+    with open(path or registry_path(), encoding="utf-8") as fh:
+        raw = json.load(fh)
+    profiles = {}
+    accounts = {}
+    for key, cfg in raw.items():
+        profile = Profile(
+            key=key,
+            title=cfg["title"],
+            account=str(cfg["account"]),
+            invoice_pattern=cfg["invoice_pattern"],
+        )
+        if profile.account in accounts:
+            raise ValueError(
+                f"Account {profile.account} is used by both '{accounts[profile.account]}' and '{key}'"
+            )
+        accounts[profile.account] = key
+        profiles[key] = profile
+    return profiles
+
+
+def get_profile(key: str) -> Profile:
+    try:
+        return load_profiles(registry_path())[key]
+    except KeyError:
+        raise KeyError(f"Unknown vendor profile: {key}") from None
+
+
+def profile_for_account(account):
+    """
+    Returns the profile registered for a page-1 account number, or None.
+    """
+    if not account:
+        return None
+    return _account_index(registry_path()).get(account)
+
+
+@lru_cache(maxsize=None)
+def _account_index(path: str) -> dict:
+    return {p.account: p for p in load_profiles(path).values()}
+
+
+_bundled = load_profiles(BUNDLED_PROFILES)
+VCC = _bundled["vcc"]
+UKM = _bundled["ukm"]
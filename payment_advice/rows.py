@@ -0,0 +1,119 @@
+"""
+Parsed record types and the columnar buffer that collects them.
+"""
+from array import array
+from functools import lru_cache
+from typing import NamedTuple
+
+RAW_COLUMNS = [
+    'Invoice Number', 'Invoice Date', 'Invoice Amount', 'GST Adjustment',
+    'Payment Amount', 'TDS_Signed', 'Debit Note', 'Status'
+]
+
+STATUSES = ("MAIN ENTRY", "GST PAID", "GST HOLD")
+_STATUS_CODES = {s: n for n, s in enumerate(STATUSES)}
+
+
+@lru_cache(maxsize=None)
+def text_dtype():
+    """
+    Whatever this pandas infers for text ("str" on pandas 3, object before).
+    """
+    import pandas as pd
+
+    return pd.Series([""]).dtype
+
+
+class AdviceRow(NamedTuple):
+    """
+    One MAIN ENTRY / GST PAID / GST HOLD line, after de-duplication.
+    """
+    invoice_number: str
+    invoice_date: str
+    invoice_amount: float
+    gst_adjustment: float
+    payment_amount: float
+    debit_note: float
+    status: str
+
+
+class TdsCapture(NamedTuple):
+    """
+    The signed 'TDS Amount' captured for an invoice (first one wins).
+    """
+    invoice_number: str
+    tds_signed: float
+
+
+class RowBuffer:
+    """
+    Column-wise accumulator for AdviceRow records: amounts in float64 arrays,
+    Invoice Number and Status as category codes, turned into the raw DataFrame
+    in one step.
+    """
+    __slots__ = (
+        'invoices', 'invoice_code', 'invoice_date', 'invoice_amount', 'gst_adjustment',
+        'payment_amount', 'debit_note', 'status',
+    )
+
+    def __init__(self):
+        # invoice number -> code, in order of first appearance
+        self.invoices = {}
+        self.invoice_code = array('i')
+        self.invoice_date = []
+        self.invoice_amount = array('d')
+        self.gst_adjustment = array('d')
+        self.payment_amount = array('d')
+        self.debit_note = array('d')
+        self.status = array('b')
+
+    def __len__(self):
+        return len(self.invoice_code)
+
+    def append(self, row: AdviceRow):
+        self.invoice_code.append(self.invoices.setdefault(row.invoice_number, len(self.invoices)))
+        self.invoice_date.append(row.invoice_date)
+        self.invoice_amount.append(row.invoice_amount)
+        self.gst_adjustment.append(row.gst_adjustment)
+        self.payment_amount.append(row.payment_amount)
+        self.debit_note.append(row.debit_note)
+        self.status.append(_STATUS_CODES[row.status])
+
+    def __iter__(self):
+        invoices = list(self.invoices)
+        for n in range(len(self)):
+            yield AdviceRow(
+                invoices[self.invoice_code[n]], self.invoice_date[n], self.invoice_amount[n],
+                self.gst_adjustment[n], self.payment_amount[n], self.debit_note[n],
+                STATUSES[self.status[n]],
+            )
+
+    def to_frame(self, tds_map_signed=None):
+        """
+        The raw table (RAW_COLUMNS) with TDS_Signed mapped per invoice and
+        Invoice Number as a categorical.
+        """
+        # Deferred so the parsing stages run without pandas loaded.
+        import numpy as np
+        import pandas as pd
+
+        tds_map_signed = tds_map_signed or {}
+        # int32 is the code width pandas keeps; wider codes are converted with extra copies.
+        codes = np.array(self.invoice_code, dtype=np.int32)
+        # One lookup per distinct invoice, then broadcast by code.
+        tds = np.fromiter(
+            (tds_map_signed.get(inv, 0.0) for inv in self.invoices),
+            dtype=np.float64, count=len(self.invoices),
+        )[codes]
+        return pd.DataFrame({
+            'Invoice Number': pd.Categorical.from_codes(
+                codes, dtype=pd.CategoricalDtype(pd.Index(list(self.invoices), dtype=text_dtype())), validate=False
+            ),
+            'Invoice Date': pd.Series(self.invoice_date, dtype=text_dtype()),
+            'Invoice Amount': np.array(self.invoice_amount, dtype=np.float64),
+            'GST Adjustment': np.array(self.gst_adjustment, dtype=np.float64),
+            'Payment Amount': np.array(self.payment_amount, dtype=np.float64),
+            'TDS_Signed': tds,
+            'Debit Note': np.array(self.debit_note, dtype=np.float64),
+            'Status': pd.Categorical.from_codes(np.array(self.status, dtype=np.int8), STATUSES),
+        }, columns=RAW_COLUMNS)
@@ -0,0 +1,295 @@
+"""
+Asynchronous HTTP ingestion service (Starlette, optional dependency).
+
+    POST /advices                   upload a PDF (raw body or multipart field "file"); ?ocr=1 reads scanned pages
+    GET  /advices/{job_id}          job status
+    GET  /advices/{job_id}/result   summary as JSON, or ?format=xlsx|csv|parquet
+    GET  /health                    queue depth and pool size
+
+Uploads are queued and parsed in a bounded process pool by the same
+parse_advice() (account gate included) the Streamlit apps use. When the
+queue is full, new uploads get 503 with Retry-After instead of piling up.
+
+    python -m payment_advice serve --port 8000 --workers 4 --queue 64
+"""
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from .cache import cache_key, default_cache
+from .export import EXPORT_FORMATS, available_formats, export_bytes
+from .ocr import ocr_available
+from .parser import ENGINES, InvalidAdviceError, ParseResult, parse_advice
+from .profiles import get_profile
+from .startup import process_pool
+
+QUEUED, RUNNING, DONE, REJECTED, FAILED = "queued", "running", "done", "rejected", "failed"
+
+
+@dataclass
+class Job:
+    job_id: str
+    file_name: str
+    profile_key: str
+    engine: str
+    pdf_bytes: bytes = field(repr=False)
+    ocr: bool = False
+    key: str = field(default=None, repr=False)
+    status: str = QUEUED
+    error: str = ""
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: float = None
+    result: ParseResult = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        record = {
+            'job_id': self.job_id, 'file_name': self.file_name, 'status': self.status,
+            'submitted_at': self.submitted_at, 'finished_at': self.finished_at,
+        }
+        if self.error:
+            record['error'] = self.error
+        if self.result is not None:
+            record.update(
+                profile=self.result.profile.key, invoices=len(self.result.pivot), rows=len(self.result.raw),
+                result=f"/advices/{self.job_id}/result",
+            )
+        return record
+
+
+def _parse_job(pdf_bytes: bytes, profile_key: str, engine: str, ocr: bool) -> ParseResult:
+    # Runs in a pool worker; InvalidAdviceError pickles back to the event loop.
+    profile = get_profile(profile_key) if profile_key else None
+    return parse_advice(pdf_bytes, profile, engine=engine, ocr=ocr)
+
+
+def _cached_result(pdf_bytes: bytes, profile, engine: str, ocr: bool):
+    # (cache key, cached result or None); hashing and a disk-tier read are blocking work.
+    key = cache_key(pdf_bytes, profile, engine, ocr)
+    return key, default_cache().get(key)
+
+
+class JobManager:
+    """
+    Bounded job queue in front of a process pool. `workers` jobs are parsed at
+    once, at most `max_queue` wait behind them, and the last `keep_jobs`
+    finished jobs stay available for download.
+    """
+
+    def __init__(self, workers: int = 1, max_queue: int = 64, keep_jobs: int = 256):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.keep_jobs = keep_jobs
+        self.jobs = OrderedDict()
+        self._queue = None
+        self._pool = None
+        self._consumers = []
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._pool = process_pool(self.workers)
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._pool.shutdown(cancel_futures=True)
+
+    async def submit(self, pdf_bytes: bytes, file_name: str, profile_key: str = None, engine: str = "text",
+                     ocr: bool = False) -> Job:
+        """
+        Queues one upload. Raises asyncio.QueueFull when the queue is at capacity.
+        A result already in the parse cache completes the job immediately.
+        """
+        job = Job(uuid.uuid4().hex, file_name, profile_key, engine, pdf_bytes, ocr)
+        profile = get_profile(profile_key) if profile_key else None
+        job.key, cached = await asyncio.to_thread(_cached_result, pdf_bytes, profile, engine, ocr)
+        if cached is not None:
+            self._finish(job, DONE, result=cached)
+        else:
+            self._queue.put_nowait(job)
+        self._remember(job)
+        return job
+
+    def pending(self) -> int:
+        return self._queue.qsize() + sum(job.status == RUNNING for job in self.jobs.values())
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            try:
+                result = await loop.run_in_executor(
+                    self._pool, _parse_job, job.pdf_bytes, job.profile_key, job.engine, job.ocr
+                )
+            except InvalidAdviceError as e:
+                self._finish(job, REJECTED, error=str(e))
+            except Exception as e:
+                self._finish(job, FAILED, error=f"{type(e).__name__}: {e}")
+            else:
+                # Pickling to the disk tier and evicting stay off the event loop.
+                await asyncio.to_thread(default_cache().put, job.key, result)
+                self._finish(job, DONE, result=result)
+            finally:
+                self._queue.task_done()
+
+    def _finish(self, job, status, error="", result=None):
+        job.status, job.error, job.result = status, error, result
+        job.finished_at = time.time()
+        job.pdf_bytes = b""
+
+    def _remember(self, job):
+        self.jobs[job.job_id] = job
+        finished = [j for j in self.jobs.values() if j.finished_at is not None]
+        for old in finished[:max(0, len(finished) - self.keep_jobs)]:
+            del self.jobs[old.job_id]
+
+
+def _error(status_code: int, message: str, **headers) -> JSONResponse:
+    return JSONResponse({'error': message}, status_code=status_code, headers=headers or None)
+
+
+# Room for the multipart boundaries and part headers around the file itself.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """
+    Raised while reading an upload once it passes the size limit.
+    """
+
+
+async def _read_body(request, max_bytes: int) -> bytes:
+    """
+    The request body, read chunk by chunk. Raises UploadTooLarge as soon as it
+    passes max_bytes, Content-Length or not (chunked uploads have none).
+    """
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(size)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def _read_upload(request, max_bytes: int):
+    """
+    Returns (pdf_bytes, file_name) from a raw PDF body or a multipart "file" field.
+    Raises UploadTooLarge for a body over max_bytes.
+    """
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        body = await _read_body(request, max_bytes + MULTIPART_OVERHEAD)
+
+        async def replay():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        # The form parser reads the bounded body, never the socket.
+        form = await Request(request.scope, replay).form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            return None, None
+        return await upload.read(), upload.filename or "advice.pdf"
+    return await _read_body(request, max_bytes), request.query_params.get("name", "advice.pdf")
+
+
+def create_app(workers: int = None, max_queue: int = 64, max_upload_mb: int = 50) -> Starlette:
+    """
+    Builds the service. Nothing runs until the app is started by an ASGI server
+    (or a TestClient), which also starts and stops the process pool.
+    """
+    manager = JobManager(workers or os.cpu_count() or 1, max_queue)
+    max_upload = max_upload_mb * 1024 * 1024
+
+    async def submit_advice(request):
+        declared = int(request.headers.get("content-length") or 0)
+        if declared > max_upload:
+            return _error(413, f"Upload exceeds {max_upload_mb} MB")
+        profile_key = request.query_params.get("profile") or None
+        engine = request.query_params.get("engine", "text")
+        if engine not in ENGINES:
+            return _error(400, f"Unknown engine {engine!r}; expected one of {ENGINES}")
+        ocr = request.query_params.get("ocr", "0").lower() in ("1", "true", "yes")
+        if ocr and not ocr_available():
+            return _error(400, "OCR is not available on this server (needs pytesseract and tesseract)")
+        if profile_key:
+            try:
+                get_profile(profile_key)
+            except KeyError:
+                return _error(400, f"Unknown profile {profile_key!r}")
+
+        try:
+            pdf_bytes, file_name = await _read_upload(request, max_upload)
+        except UploadTooLarge:
+            return _error(413, f"Upload exceeds {max_upload_mb} MB")
+        if not pdf_bytes:
+            return _error(400, "Expected a PDF body or a multipart 'file' field")
+        if len(pdf_bytes) > max_upload:
+            return _error(413, f"Upload exceeds {max_upload_mb} MB")
+        try:
+            job = await manager.submit(pdf_bytes, file_name, profile_key, engine, ocr)
+        except asyncio.QueueFull:
+            return _error(503, "Ingestion queue is full; retry later", **{'Retry-After': "5"})
+        return JSONResponse(job.to_dict(), status_code=202, headers={'Location': f"/advices/{job.job_id}"})
+
+    async def job_status(request):
+        job = manager.jobs.get(request.path_params["job_id"])
+        if job is None:
+            return _error(404, "Unknown job")
+        return JSONResponse(job.to_dict())
+
+    async def job_result(request):
+        job = manager.jobs.get(request.path_params["job_id"])
+        if job is None:
+            return _error(404, "Unknown job")
+        if job.status in (REJECTED, FAILED):
+            return _error(422, job.error)
+        if job.status != DONE:
+            return _error(409, f"Job is {job.status}")
+
+        fmt = request.query_params.get("format", "json")
+        result = job.result
+        if fmt == "json":
+            return JSONResponse({
+                'job_id': job.job_id, 'profile': result.profile.key,
+                'summary': result.pivot.to_dict(orient="records"),
+            })
+        if fmt not in available_formats():
+            return _error(400, f"Unknown format {fmt!r}; expected json or one of {available_formats()}")
+        ext, mime = EXPORT_FORMATS[fmt]
+        stem = os.path.splitext(job.file_name)[0]
+        # Export is CPU work too; keep it off the event loop.
+        data = await asyncio.to_thread(export_bytes, result.pivot, result.raw, fmt)
+        return Response(data, media_type=mime,
+                        headers={'Content-Disposition': f'attachment; filename="{stem}_summary.{ext}"'})
+
+    async def health(request):
+        return JSONResponse({'workers': manager.workers, 'pending': manager.pending(), 'max_queue': manager.max_queue})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await manager.start()
+        try:
+            yield
+        finally:
+            await manager.stop()
+
+    app = Starlette(routes=[
+        Route("/advices", submit_advice, methods=["POST"]),
+        Route("/advices/{job_id}", job_status),
+        Route("/advices/{job_id}/result", job_result),
+        Route("/health", health),
+    ], lifespan=lifespan)
+    app.state.jobs = manager
+    return app
@@ -0,0 +1,70 @@
+"""
+Import cost control: preloading heavy modules once for process pools, and
+warming them up in the background so an interactive start is not blocked.
+
+The package imports pandas, pdfplumber and pdfminer only in the stages that
+use them. A pool worker would otherwise pay that import on its first task,
+once per worker; process_pool() makes sure it is paid once:
+
+- fork:       the parent imports them and every worker inherits them;
+- forkserver: the server preloads them before forking workers;
+- spawn:      each worker imports them in its initializer, before any task.
+"""
+import importlib
+import multiprocessing
+import threading
+
+# What a worker needs for page text extraction only.
+EXTRACT_MODULES = ("pdfplumber", "payment_advice.extract", "payment_advice.layout", "payment_advice.prefilter")
+
+# What a worker needs to parse an advice into frames and export it.
+PARSE_MODULES = EXTRACT_MODULES + (
+    "pandas", "payment_advice.parser", "payment_advice.rows", "payment_advice.aggregate", "payment_advice.export",
+)
+
+_warm_up_thread = None
+
+
+def preload(modules=PARSE_MODULES):
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _init_preloaded(modules, initializer, initargs):
+    preload(modules)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def process_pool(max_workers: int, modules=PARSE_MODULES, initializer=None, initargs=()):
+    """
+    A ProcessPoolExecutor whose workers start with `modules` already imported.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Never fork while the warm-up thread may hold an import lock.
+    if _warm_up_thread is not None:
+        _warm_up_thread.join()
+    ctx = multiprocessing.get_context()
+    method = ctx.get_start_method()
+    if method == "fork":
+        preload(modules)
+    elif method == "forkserver":
+        ctx.set_forkserver_preload(list(modules))
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=ctx,
+        initializer=_init_preloaded, initargs=(tuple(modules), initializer, initargs),
+    )
+
+
+def warm_up(modules=PARSE_MODULES) -> threading.Thread:
+    """
+    Fast-start mode: imports `modules` on a daemon thread and returns at once.
+    Code that needs them before the thread is done simply waits on the import
+    lock. Repeated calls (e.g. Streamlit reruns) reuse the first thread.
+    """
+    global _warm_up_thread
+    if _warm_up_thread is None:
+        _warm_up_thread = threading.Thread(target=preload, args=(tuple(modules),), name="warm-up", daemon=True)
+        _warm_up_thread.start()
+    return _warm_up_thread
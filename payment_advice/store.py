@@ -0,0 +1,209 @@
+"""
+Persistent invoice store across advices (SQLite, stdlib only).
+
+Each ingested advice is identified by the SHA-256 of its PDF bytes, so an
+advice that was already ingested is never parsed again. An entry
+(invoice number, amount, status) is counted once in the cumulative pivot, no
+matter how many overlapping advices carry it. entry_sources records which
+advices it came from. The per-invoice pivot is updated incrementally as new
+entries arrive instead of being recomputed.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from typing import TYPE_CHECKING
+
+from .parser import _as_file, iter_records, open_advice
+from .profiles import get_profile
+from .rows import TdsCapture
+
+# pandas is only needed to read the pivot back out; ingest runs without it.
+if TYPE_CHECKING:
+    import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS advices (
+    advice_id   TEXT PRIMARY KEY,
+    file_name   TEXT,
+    profile     TEXT NOT NULL,
+    ingested_at REAL NOT NULL,
+    rows_new    INTEGER NOT NULL,
+    rows_seen   INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    invoice_number TEXT NOT NULL,
+    key_amount     REAL NOT NULL,
+    status         TEXT NOT NULL,
+    invoice_date   TEXT,
+    invoice_amount REAL NOT NULL,
+    gst_adjustment REAL NOT NULL,
+    payment_amount REAL NOT NULL,
+    debit_note     REAL NOT NULL,
+    first_advice   TEXT NOT NULL REFERENCES advices(advice_id),
+    PRIMARY KEY (invoice_number, key_amount, status)
+);
+CREATE TABLE IF NOT EXISTS entry_sources (
+    advice_id      TEXT NOT NULL REFERENCES advices(advice_id),
+    invoice_number TEXT NOT NULL,
+    key_amount     REAL NOT NULL,
+    status         TEXT NOT NULL,
+    PRIMARY KEY (advice_id, invoice_number, key_amount, status)
+);
+CREATE TABLE IF NOT EXISTS invoice_pivot (
+    invoice_number TEXT PRIMARY KEY,
+    invoice_amount REAL NOT NULL,
+    gst_adjustment REAL NOT NULL,
+    payment_amount REAL NOT NULL,
+    debit_note     REAL NOT NULL,
+    tds_signed     REAL,
+    invoice_date   TEXT
+);
+"""
+
+_UPSERT_PIVOT = """
+INSERT INTO invoice_pivot
+    (invoice_number, invoice_amount, gst_adjustment, payment_amount, debit_note, invoice_date)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(invoice_number) DO UPDATE SET
+    invoice_amount = MAX(invoice_amount, excluded.invoice_amount),
+    gst_adjustment = gst_adjustment + excluded.gst_adjustment,
+    payment_amount = payment_amount + excluded.payment_amount,
+    debit_note     = debit_note + excluded.debit_note,
+    invoice_date   = COALESCE(invoice_date, excluded.invoice_date)
+"""
+
+# First captured TDS per invoice wins, across advices as within one.
+_UPSERT_TDS = """
+INSERT INTO invoice_pivot
+    (invoice_number, invoice_amount, gst_adjustment, payment_amount, debit_note, tds_signed)
+VALUES (?, 0, 0, 0, 0, ?)
+ON CONFLICT(invoice_number) DO UPDATE SET
+    tds_signed = COALESCE(tds_signed, excluded.tds_signed)
+"""
+
+
+def advice_id(pdf_bytes: bytes) -> str:
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def _skipped(advice):
+    return {'advice_id': advice, 'status': 'skipped', 'rows_new': 0, 'rows_seen': 0}
+
+
+class InvoiceStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_advice(self, advice: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM advices WHERE advice_id = ?", (advice,)).fetchone() is not None
+
+    def ingest(self, source, profile=None, workers: int = 1, engine: str = "text", file_name: str = None,
+               ocr: bool = False) -> dict:
+        """
+        Parses and stores one advice unless its content was ingested before.
+        Returns {'advice_id', 'status': 'ingested' | 'skipped', 'rows_new', 'rows_seen'}.
+        Raises InvalidAdviceError like parse_advice().
+        """
+        _, pdf_bytes = _as_file(source)
+        advice = advice_id(pdf_bytes)
+        if self.has_advice(advice):
+            return _skipped(advice)
+
+        with open_advice(pdf_bytes, profile, workers, engine, ocr=ocr) as (profile, page_texts):
+            return self.add_records(advice, profile.key, iter_records(page_texts, profile), file_name)
+
+    def add_records(self, advice: str, profile_key: str, records, file_name: str = None) -> dict:
+        """
+        Stores already-parsed AdviceRow / TdsCapture records for one advice in a
+        single transaction and folds new entries into the cumulative pivot.
+        """
+        rows_new = rows_seen = 0
+        with self.conn:
+            if self.has_advice(advice):
+                return _skipped(advice)
+            self.conn.execute(
+                "INSERT INTO advices VALUES (?, ?, ?, ?, 0, 0)",
+                (advice, file_name, profile_key, time.time()),
+            )
+            for rec in records:
+                if type(rec) is TdsCapture:
+                    self.conn.execute(_UPSERT_TDS, (rec.invoice_number, rec.tds_signed))
+                    continue
+                key_amount = rec.payment_amount if rec.status == "MAIN ENTRY" else rec.gst_adjustment
+                key = (rec.invoice_number, key_amount, rec.status)
+                self.conn.execute("INSERT OR IGNORE INTO entry_sources VALUES (?, ?, ?, ?)", (advice,) + key)
+                inserted = self.conn.execute(
+                    "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + (rec.invoice_date, rec.invoice_amount, rec.gst_adjustment,
+                           rec.payment_amount, rec.debit_note, advice),
+                ).rowcount
+                if not inserted:
+                    rows_seen += 1
+                    continue
+                rows_new += 1
+                self.conn.execute(_UPSERT_PIVOT, (
+                    rec.invoice_number, rec.invoice_amount, rec.gst_adjustment,
+                    rec.payment_amount, rec.debit_note, rec.invoice_date,
+                ))
+            self.conn.execute(
+                "UPDATE advices SET rows_new = ?, rows_seen = ? WHERE advice_id = ?",
+                (rows_new, rows_seen, advice),
+            )
+        return {'advice_id': advice, 'status': 'ingested', 'rows_new': rows_new, 'rows_seen': rows_seen}
+
+    def pivot(self) -> "pd.DataFrame":
+        """
+        The cumulative per-invoice summary across every ingested advice,
+        in the same layout as ParseResult.pivot.
+        """
+        import pandas as pd
+
+        from .aggregate import summary_frame
+
+        agg = pd.read_sql_query(
+            """
+            SELECT invoice_number, invoice_amount, gst_adjustment, payment_amount,
+                   COALESCE(tds_signed, 0.0) AS tds_signed, debit_note,
+                   COALESCE(invoice_date, '') AS invoice_date
+            FROM invoice_pivot
+            ORDER BY invoice_number
+            """,
+            self.conn,
+        )
+        return summary_frame(
+            agg['invoice_number'], agg['invoice_amount'], agg['gst_adjustment'], agg['payment_amount'],
+            agg['tds_signed'], agg['debit_note'], agg['invoice_date'],
+        )
+
+    def advices(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.read_sql_query(
+            "SELECT advice_id, file_name, profile, datetime(ingested_at, 'unixepoch') AS ingested_at, "
+            "rows_new, rows_seen FROM advices ORDER BY ingested_at",
+            self.conn,
+        )
+
+
+def parse_records(path: str, profile_key: str = None, engine: str = "text", ocr: bool = False):
+    """
+    Parses one advice file without touching a store, for use in pool workers
+    (SQLite keeps a single writer). Returns (advice_id, profile_key, records, file_name).
+    """
+    _, pdf_bytes = _as_file(path)
+    profile = get_profile(profile_key) if profile_key else None
+    with open_advice(pdf_bytes, profile, engine=engine, ocr=ocr) as (profile, page_texts):
+        records = list(iter_records(page_texts, profile))
+    return advice_id(pdf_bytes), profile.key, records, os.path.basename(path)
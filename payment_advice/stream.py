@@ -0,0 +1,89 @@
+"""
+Bounded-memory parsing: stream typed records page by page and fold them into
+the per-invoice pivot without building the raw table.
+"""
+import pandas as pd
+
+from .aggregate import summary_frame
+from .parser import iter_records, open_advice
+from .rows import TdsCapture
+
+
+def iter_rows(source, profile=None, workers: int = 1, engine: str = "text", ocr: bool = False):
+    """
+    Yields AdviceRow and TdsCapture records in document order. Each page's text
+    and pdfplumber caches are released once the page has been consumed.
+    """
+    with open_advice(source, profile, workers, engine, ocr=ocr) as (profile, page_texts):
+        yield from iter_records(page_texts, profile)
+
+
+class PivotAccumulator:
+    """
+    Incremental equivalent of build_pivot(): per invoice, max Invoice Amount,
+    summed GST / Payment / Debit Note, first Invoice Date and the signed TDS.
+    Sums use the same compensated summation as pandas' groupby sum, so the
+    folded pivot matches the DataFrame path exactly.
+    """
+
+    def __init__(self):
+        # invoice -> [inv_amt_max, gst_sum, gst_comp, pay_sum, pay_comp, debit_sum, debit_comp, first_date]
+        self._invoices = {}
+        self.tds_map_signed = {}
+        self.rows = 0
+
+    def add(self, record):
+        if type(record) is TdsCapture:
+            self.tds_map_signed[record.invoice_number] = record.tds_signed
+            return
+        self.rows += 1
+        acc = self._invoices.get(record.invoice_number)
+        if acc is None:
+            self._invoices[record.invoice_number] = [
+                record.invoice_amount,
+                record.gst_adjustment, 0.0,
+                record.payment_amount, 0.0,
+                record.debit_note, 0.0,
+                record.invoice_date,
+            ]
+            return
+        if record.invoice_amount > acc[0]:
+            acc[0] = record.invoice_amount
+        _kahan_add(acc, 1, record.gst_adjustment)
+        _kahan_add(acc, 3, record.payment_amount)
+        _kahan_add(acc, 5, record.debit_note)
+
+    def update(self, records):
+        for record in records:
+            self.add(record)
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        keys = sorted(self._invoices)
+        accs = [self._invoices[k] for k in keys]
+        return summary_frame(
+            keys,
+            [a[0] for a in accs],
+            [a[1] for a in accs],
+            [a[3] for a in accs],
+            [self.tds_map_signed.get(k, 0.0) for k in keys],
+            [a[5] for a in accs],
+            [a[7] for a in accs],
+        )
+
+
+def _kahan_add(acc, i, value):
+    y = value - acc[i + 1]
+    t = acc[i] + y
+    acc[i + 1] = t - acc[i] - y
+    acc[i] = t
+
+
+def summarize_advice(source, profile=None, workers: int = 1, engine: str = "text", ocr: bool = False):
+    """
+    Streams one advice straight into its invoice pivot without keeping the raw
+    rows. Returns (profile, pivot_df, tds_map_signed).
+    """
+    with open_advice(source, profile, workers, engine, ocr=ocr) as (profile, page_texts):
+        acc = PivotAccumulator().update(iter_records(page_texts, profile))
+    return profile, acc.to_frame(), acc.tds_map_signed
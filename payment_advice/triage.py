@@ -0,0 +1,158 @@
+"""
+Fast triage: screen advices from their metadata and page 1 only, without a parse.
+
+inspect_advice() opens the PDF with pdfminer directly: the page count comes
+from the page tree, and page 1's account number from its decoded content
+stream (see prefilter.shown_strings). No layout or character work is done and
+no other page is touched. The account is only taken from the content stream
+when it reads the same with the strings kept apart and glued together;
+otherwise page 1 goes through the gate's own extraction. Either way the
+verdict comes from gate_account(), the check parse_advice() applies.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from .parser import InvalidAdviceError, _as_file, gate_account, invalid_advice, open_page1, read_account
+from .profiles import Profile
+
+OK, REJECTED = "OK", "REJECTED"
+
+
+@dataclass
+class AdviceInfo:
+    """
+    What triage learned about one file. estimated_rows is page 1's invoice
+    lines times the page count.
+    """
+    file_name: str
+    status: str = OK
+    reason: str = ""
+    pages: int = 0
+    encrypted: bool = False
+    scanned: bool = False
+    account: str = None
+    profile: str = None
+    page1_rows: int = 0
+    estimated_rows: int = 0
+    producer: str = ""
+    created: str = ""
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def inspect_advice(source, profile: Profile = None, file_name: str = None) -> AdviceInfo:
+    """
+    Triage of one advice (path, bytes or file object). Never raises; a file
+    the account gate would refuse comes back REJECTED with the reason.
+    """
+    start = time.perf_counter()
+    if file_name is None:
+        file_name = os.path.basename(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    info = AdviceInfo(file_name)
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            # Only the trailer, the page tree and page 1 are read from disk.
+            with open(source, "rb") as fh:
+                _inspect(fh, info, profile)
+        else:
+            _inspect(_as_file(source)[0], info, profile)
+    except InvalidAdviceError as e:
+        info.status, info.reason = REJECTED, str(e)
+    except Exception as e:
+        # Whatever pdfminer trips on (an unsupported /Filter, say) fails the parse as well.
+        info.status, info.reason = REJECTED, str(invalid_advice(f"unreadable PDF ({type(e).__name__}: {e})"))
+    info.seconds = round(time.perf_counter() - start, 4)
+    return info
+
+
+def inspect_many(sources, profile: Profile = None, workers: int = 8) -> list:
+    """
+    inspect_advice() over many files on a thread pool, in input order.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(lambda source: inspect_advice(source, profile), sources))
+
+
+def _inspect(pdf_file, info: AdviceInfo, profile: Profile):
+    from pdfminer.pdfdocument import PDFDocument, PDFPasswordIncorrect
+    from pdfminer.pdfinterp import PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    from .prefilter import has_image, literal_strings, shown_strings
+
+    try:
+        doc = PDFDocument(PDFParser(pdf_file))
+    except PDFPasswordIncorrect as e:
+        info.encrypted = True
+        raise invalid_advice("encrypted PDF (password required)") from e
+    except Exception as e:
+        raise invalid_advice(f"unreadable PDF ({type(e).__name__}: {e})") from e
+    info.encrypted = doc.encryption is not None
+    _read_metadata(doc, info)
+
+    try:
+        page1 = next(PDFPage.create_pages(doc), None)
+    except Exception as e:
+        raise invalid_advice(f"unreadable PDF ({type(e).__name__}: {e})") from e
+    if page1 is None:
+        raise invalid_advice("the PDF has no pages")
+    info.pages = _page_count(doc)
+
+    # Plain literal strings first; font decoding only if they do not show the account.
+    fragments = [raw.decode("latin-1") for stream in page1.contents for raw in literal_strings(stream)]
+    if _agreed_account(fragments) is None:
+        try:
+            fragments = shown_strings(page1, PDFResourceManager(caching=True))
+        except Exception:
+            fragments = None
+    text = "\n".join(fragments) if fragments is not None else ""
+    info.scanned = fragments is not None and not text.strip() and has_image(page1)
+    info.account = _agreed_account(fragments) if fragments is not None else None
+    if info.account is None and not info.scanned:
+        # Not readable unambiguously from the content stream; use the gate's own page-1 text.
+        pdf, text = open_page1(pdf_file)
+        pdf.close()
+        info.account = read_account(text)
+    matched = gate_account(info.account, profile, text)
+
+    info.profile = matched.key
+    invoice_match = matched.invoice_re.match
+    info.page1_rows = sum(1 for token in text.split() if invoice_match(token) is not None)
+    info.estimated_rows = info.page1_rows * info.pages
+
+
+def _agreed_account(fragments):
+    # Read with the strings kept apart and glued together: a number split over
+    # several strings, or run into the next one, reads differently and is not trusted.
+    if not fragments:
+        return None
+    account = read_account("\n".join(fragments))
+    return account if account is not None and account == read_account("".join(fragments)) else None
+
+
+def _page_count(doc) -> int:
+    from pdfminer.pdftypes import resolve1
+
+    count = resolve1(resolve1(doc.catalog.get("Pages")) or {}).get("Count")
+    if isinstance(count, int) and count > 0:
+        return count
+    # A broken /Count: walk the page tree instead.
+    from pdfminer.pdfpage import PDFPage
+
+    return sum(1 for _ in PDFPage.create_pages(doc))
+
+
+def _read_metadata(doc, info: AdviceInfo):
+    from pdfminer.pdftypes import resolve1
+    from pdfminer.utils import decode_text
+
+    for entry in doc.info:
+        for key, field in (("Producer", "producer"), ("CreationDate", "created")):
+            value = resolve1(entry.get(key))
+            if isinstance(value, bytes):
+                setattr(info, field, decode_text(value))